@@ -2,15 +2,21 @@ from sports_prediction_framework.dataloader.DataSource import DataSource
 from sports_prediction_framework.datawrapper.DataWrapper import DataWrapper
 from sports_prediction_framework.datawrapper.DataHandler import DataHandler
 from sports_prediction_framework.datawrapper.SportType import SportType
+from sports_prediction_framework.dataloader.QueryCache import QueryCache
+from sports_prediction_framework.utils.Instrumentation import Instrumentation
 import pandas as pd
 class DataLoader:
     """
     A utility class for loading and wrapping data from a database using the DataSource and DataHandler interfaces.
     Provides class methods for querying, previewing, and post-processing data.
+    Query results are memoized through `QueryCache`, so repeated calls with the same query do not touch the database.
+    The wrapping helpers build on the memoized queries, so every frame is cached once, unwrapped.
     """
 
     @classmethod
-    def load(cls, schema_name: str, table_name: str, filter_func) -> pd.DataFrame:
+    @Instrumentation.span("DataLoader.load")
+    @QueryCache.memoize
+    def load(cls, schema_name: str, table_name: str, filter_func, sport: SportType = None) -> pd.DataFrame:
         """
         Loads a DataFrame from the specified schema and table using a filter function.
 
@@ -18,16 +24,19 @@ class DataLoader:
             schema_name (str): Name of the schema in the database.
             table_name (str): Name of the table to query.
             filter_func (Callable): A function used to filter the query.
+            sport (SportType, optional): The sport type whose parser is applied to the result.
 
         Returns:
             pd.DataFrame: The resulting DataFrame from the query.
         """
-        ds = DataSource()
+        ds = DataSource(sport)
         df = ds.query(schema_name, table_name, filter_func)
         ds.close()
         return df
 
     @classmethod
+    @Instrumentation.span("DataLoader.load_distinct")
+    @QueryCache.memoize
     def load_distinct(cls, schema_name: str, table_name: str, filter_func, distinct_cols=None) -> pd.DataFrame:
         """
         Loads a DataFrame from the specified schema and table, optionally using distinct columns.
@@ -47,6 +56,8 @@ class DataLoader:
         return df
 
     @classmethod
+    @Instrumentation.span("DataLoader.preview")
+    @QueryCache.memoize
     def preview(cls, schema_name: str, table_name: str, filter_func, distinct_cols=None) -> pd.DataFrame:
         """
         Loads a preview of the data using the preview_query method.
@@ -66,6 +77,28 @@ class DataLoader:
         return df
 
     @classmethod
+    @Instrumentation.span("DataLoader.load_odds")
+    @QueryCache.memoize
+    def load_odds(cls, schema_name: str, bookmaker=None) -> pd.DataFrame:
+        """
+        Loads the 1X2 betting odds of a bookmaker.
+
+        Args:
+            schema_name (str): Name of the schema.
+            bookmaker (str, optional): The bookmaker name used to filter the odds table.
+
+        Returns:
+            pd.DataFrame: Columns 'MatchID', 'odds_1', 'odds_X' and 'odds_2'.
+        """
+        ds = DataSource()
+        bookie_func = lambda c: c.Bookmaker == bookmaker
+        bets = ds.query_no_parse(schema_name, "Odds_1x2", bookie_func)
+        ds.close()
+        bets = bets.rename(columns={"1": "odds_1", "X": "odds_X", "2": "odds_2"})
+        return bets[["MatchID", "odds_1", "odds_X", "odds_2"]]
+
+    @classmethod
+    @Instrumentation.span("DataLoader.load_and_wrap")
     def load_and_wrap(cls, schema_name, table_name, filter_func, sport: SportType = None):
         """
         Loads data from the database and wraps it using the appropriate wrapper for the specified sport.
@@ -79,15 +112,11 @@ class DataLoader:
         Returns:
             DataWrapper: A wrapped handler containing the queried data.
         """
-        ds = DataSource(sport)
-        df = ds.query(schema_name, table_name, filter_func)
-        handler = DataHandler(df)
-        wrapper = sport.get_wrapper()(handler)
-        ds.close()
-
-        return wrapper
+        df = cls.load(schema_name, table_name, filter_func, sport)
+        return sport.get_wrapper()(DataHandler(df))
 
     @classmethod
+    @Instrumentation.span("DataLoader.load_and_wrap_odds")
     def load_and_wrap_odds(cls, schema_name, table_name, filter_func, sport: SportType = None, bookmaker=None):
         """
         Loads match data along with corresponding betting odds and wraps it for the given sport.
@@ -102,21 +131,10 @@ class DataLoader:
         Returns:
             DataWrapper: A wrapped handler containing the match and betting odds data.
         """
-        ds = DataSource(sport)
-        df = ds.query(schema_name, table_name, filter_func)
-
-        bookie_func = lambda c: c.Bookmaker == bookmaker
-        bets = ds.query_no_parse(schema_name, "Odds_1x2", bookie_func)
-        bets = bets.rename(columns={"1": "odds_1", "X": "odds_X", "2": "odds_2"})
-
-        cols_to_join = ["MatchID", "odds_1", "odds_X", "odds_2"]
-        odds_subset = bets[cols_to_join]
+        df = cls.load(schema_name, table_name, filter_func, sport)
+        odds_subset = cls.load_odds(schema_name, bookmaker)
         df = df.merge(odds_subset, on="MatchID", how="inner")
         df[["odds_1", "odds_X", "odds_2"]] = df[["odds_1", "odds_X", "odds_2"]].apply(pd.to_numeric, errors='coerce')
 
-        handler = DataHandler(df)
-        wrapper = sport.get_wrapper()(handler)
-        ds.close()
-
-        return wrapper
+        return sport.get_wrapper()(DataHandler(df))
 
@@ -0,0 +1,144 @@
+import functools
+import hashlib
+import inspect
+import os
+from enum import Enum
+
+from sqlalchemy import column
+from sqlalchemy.dialects import postgresql
+
+from sports_prediction_framework.utils.Cache import Cache
+
+
+class _ColumnProxy:
+    """
+    Stand-in for `Table.c` that builds unbound column expressions by name.
+
+    Lets a filter function be compiled to SQL without reflecting the table from the database.
+    """
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return column(name)
+
+    def __getitem__(self, name):
+        return column(name)
+
+
+class QueryCache:
+    """
+    Memoization layer for `DataLoader` class methods, backed by the pickle-based `Cache`.
+
+    The cache key is derived from the loader method, the schema and table names, the compiled SQL
+    of `filter_func(table.c)` and every remaining argument (sport type, bookmaker, distinct columns).
+    Changing the filter therefore produces a new key and the stale entry is simply never read again.
+
+    Attributes:
+        enabled (bool): Whether decorated loader methods read from and write to the cache.
+        directory (str): Directory in which cache entries are stored.
+    """
+
+    enabled = True
+    directory = "cache"
+
+    @classmethod
+    def configure(cls, directory: str = None, enabled: bool = None) -> None:
+        """
+        Updates the cache configuration.
+
+        Args:
+            directory (str, optional): New directory for cache entries.
+            enabled (bool, optional): Enables or disables the cache.
+        """
+        if directory is not None:
+            cls.directory = directory
+        if enabled is not None:
+            cls.enabled = enabled
+
+    @classmethod
+    def clear(cls) -> None:
+        """
+        Removes all cache entries created by the query cache from the configured directory.
+        """
+        if not os.path.isdir(cls.directory):
+            return
+        for filename in os.listdir(cls.directory):
+            if filename.startswith("query_") and filename.endswith(".pkl"):
+                os.remove(os.path.join(cls.directory, filename))
+
+    @staticmethod
+    def compile_filter(filter_func) -> str:
+        """
+        Compiles the filter function to a SQL string without touching the database.
+
+        Args:
+            filter_func (Callable): A function used to filter the query.
+
+        Returns:
+            str: The SQL text of the filter expression, including its bound values.
+        """
+        expression = filter_func(_ColumnProxy())
+        try:
+            return str(expression.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+        except Exception:
+            compiled = expression.compile(dialect=postgresql.dialect())
+            return str(compiled) + repr(sorted(compiled.params.items()))
+
+    @classmethod
+    def make_key(cls, method_name: str, arguments: dict) -> str:
+        """
+        Builds the cache key for a loader call.
+
+        Args:
+            method_name (str): Name of the decorated loader method.
+            arguments (dict): Bound arguments of the call, excluding the class.
+
+        Returns:
+            str: File name of the cache entry.
+        """
+        parts = [method_name]
+        for name, value in arguments.items():
+            if name == "filter_func":
+                value = cls.compile_filter(value)
+            elif isinstance(value, Enum):
+                value = value.name
+            parts.append(f"{name}={value}")
+        digest = hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()[:24]
+        return f"query_{method_name}_{arguments.get('schema_name')}_{arguments.get('table_name')}_{digest}.pkl"
+
+    @classmethod
+    def memoize(cls, func):
+        """
+        Decorator caching the result of a `DataLoader` class method.
+
+        Must be applied below `@classmethod`. The database is only queried when no entry exists
+        for the derived key or the cache is disabled.
+
+        Args:
+            func (Callable): The loader method to wrap.
+
+        Returns:
+            Callable: The wrapped method.
+        """
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not cls.enabled:
+                return func(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(list(bound.arguments.items())[1:])
+            filepath = os.path.join(cls.directory, cls.make_key(func.__name__, arguments))
+
+            if Cache.exists(filepath):
+                return Cache.load(filepath)
+
+            result = func(*args, **kwargs)
+            os.makedirs(cls.directory, exist_ok=True)
+            Cache.save(result, filepath)
+            return result
+
+        return wrapper
@@ -1,4 +1,6 @@
 import pandas as pd
+import numpy as np
+import weakref
 import copy
 
 
@@ -24,6 +26,20 @@ class DataHandler:
         self.label_cols = set(label_cols) if label_cols is not None else set()
         self.feature_cols = set(feature_cols) if feature_cols is not None else set()
 
+        self._index_cache = {}  # Derived row indices, valid only for the frame they were built from
+        self._source = None  # Handler this frame's rows were taken from, see set_source()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('_index_cache', None)
+        state.pop('_source', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._index_cache = {}
+        self._source = None
+
     def get_dataframe(self):
         """
         Returns the underlying DataFrame.
@@ -123,6 +139,130 @@ class DataHandler:
         """
         self.dataframe = self.dataframe.join(data)
 
+    def get_sorted_index(self, column, rows: np.ndarray = None):
+        """
+        Returns the row positions that sort the DataFrame by a column, together with the sorted values.
+
+        The result is computed once and reused until the DataFrame is replaced or changes its shape,
+        so repeated range selections on the same frame only need a binary search.
+        With `rows`, only those rows are sorted and the order holds positions within `rows`. Such indices
+        are kept per rows array for as long as the array is alive, so subsets taken with the same positions
+        at every step (e.g. one league from a group index) share a single sort.
+
+        Args:
+            column (str): Column to sort by.
+            rows (np.ndarray, optional): Row positions of a subset of the frame.
+
+        Returns:
+            tuple[np.ndarray, pd.Index]: Stable sort order (row positions) and the column values in that order.
+        """
+        def build():
+            values = self.dataframe[column].to_numpy()
+            if rows is not None:
+                values = values[rows]
+            order = np.argsort(values, kind='stable')
+            return order, pd.Index(values[order])
+
+        if rows is None:
+            return self.get_cached(('sorted', column), build)
+
+        subsets = self.get_cached(('sorted subsets', column), dict)
+        key = id(rows)
+        entry = subsets.get(key)
+        if entry is not None and entry[0]() is rows:
+            return entry[1]
+        value = build()
+        subsets[key] = (weakref.ref(rows, lambda _: subsets.pop(key, None)), value)
+        return value
+
+    def get_group_index(self, column):
+        """
+        Returns a mapping from each distinct value of a column to the row positions holding it.
+
+        Values are ordered by first appearance, rows keep their original order and missing values are left out.
+        The mapping is computed in a single pass and reused until the DataFrame is replaced or changes its shape.
+
+        Args:
+            column (str): Column to group by.
+
+        Returns:
+            dict: Mapping of column value to a numpy array of row positions.
+        """
+        def build():
+            codes, uniques = pd.factorize(self.dataframe[column])
+            order = np.argsort(codes, kind='stable')
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            groups = np.split(order[len(codes) - counts.sum():], np.cumsum(counts)[:-1])
+            return dict(zip(uniques.tolist(), groups))
+
+        return self.get_cached(('group', column), build)
+
+    def set_source(self, parent: "DataHandler", rows: np.ndarray):
+        """
+        Records that the rows of this handler's frame are the given row positions of the parent's frame.
+
+        Positions are resolved to the parent's own source, so a chain of subsets refers to the frame it was
+        first taken from. Row indices cached on that frame can then serve every subset of it.
+
+        Args:
+            parent (DataHandler): Handler the rows were taken from.
+            rows (np.ndarray): Row positions in the parent's frame, one per row of this frame.
+        """
+        source = parent.get_source()
+        if source is not None:
+            parent, parent_rows = source
+            rows = parent_rows[rows]
+        self._source = (parent, weakref.ref(parent.dataframe), parent.dataframe.shape,
+                        weakref.ref(self.dataframe), np.asarray(rows))
+
+    def get_source(self):
+        """
+        Returns the handler this frame was taken from and the row positions in its frame.
+
+        Returns:
+            tuple or None: (handler, rows), or None if no source is recorded or either frame has been
+            replaced or changed its shape since.
+        """
+        source = self.__dict__.get('_source')
+        if source is None:
+            return None
+        parent, parent_ref, shape, frame_ref, rows = source
+        if parent_ref() is not parent.dataframe or parent.dataframe.shape != shape or \
+                frame_ref() is not self.dataframe or len(self.dataframe) != len(rows):
+            return None
+        return parent, rows
+
+    def invalidate_indices(self):
+        """
+        Drops all cached row indices and the recorded source.
+        Needed only after modifying the DataFrame values in place.
+        """
+        self._index_cache = {}
+        self._source = None
+
+    def get_cached(self, key, build):
+        """
+        Returns a value derived from the current DataFrame, building it on first use.
+
+        Cached values are discarded as soon as the DataFrame is replaced or changes its shape.
+
+        Args:
+            key (hashable): Identifier of the derived value.
+            build (Callable): Zero-argument function computing the value from the current DataFrame.
+
+        Returns:
+            Any: The cached or freshly built value.
+        """
+        cache = self.__dict__.setdefault('_index_cache', {})
+        entry = cache.get(key)
+        if entry is not None:
+            frame_ref, shape, value = entry
+            if frame_ref() is self.dataframe and shape == self.dataframe.shape:
+                return value
+        value = build()
+        cache[key] = (weakref.ref(self.dataframe), self.dataframe.shape, value)
+        return value
+
     def copy(self, dataframe: pd.DataFrame = None, feat_cols=None, label_cols=None):
         """
         Creates a deep copy of the DataHandler.
@@ -1,4 +1,5 @@
 from sports_prediction_framework.datawrapper.DataHandler import DataHandler
+from sports_prediction_framework.utils.Instrumentation import Instrumentation
 import pandas as pd
 import copy
 
@@ -150,6 +151,7 @@ class DataWrapper:
         """
         return self.get_dataframe().empty
 
+    @Instrumentation.span("DataWrapper.deepcopy")
     def deepcopy(self, dataframe: pd.DataFrame = None, feat_cols=None, label_cols=None):
         new_handler = self.data_handler.copy(dataframe, feat_cols, label_cols)
         new = self.__class__(new_handler)
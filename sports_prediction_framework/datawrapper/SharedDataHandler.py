@@ -0,0 +1,245 @@
+import atexit
+import sys
+from dataclasses import dataclass, field
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+from sports_prediction_framework.datawrapper.DataHandler import DataHandler
+
+
+@dataclass(frozen=True)
+class SharedColumn:
+    """
+    Layout of a single column inside a shared memory segment.
+
+    Attributes:
+        name: Column label in the original DataFrame.
+        kind (str): One of 'numeric', 'datetime' or 'categorical'.
+        dtype (str): NumPy dtype of the stored buffer (codes for categorical columns).
+        offset (int): Byte offset of the column inside the segment.
+        categories (list, optional): Category values for categorical columns.
+    """
+    name: object
+    kind: str
+    dtype: str
+    offset: int
+    categories: list = None
+
+
+@dataclass(frozen=True)
+class SharedFrameSpec:
+    """
+    Picklable description of a DataFrame published to shared memory.
+
+    Passing the spec to a worker costs a few kilobytes regardless of the number of rows.
+
+    Attributes:
+        segment (str): Name of the shared memory segment.
+        num_rows (int): Number of rows in the frame.
+        columns (tuple[SharedColumn]): Layout of the published columns.
+        index (object): Either ('range', start, stop, step), ('segment', dtype, offset) or ('values', list).
+        feature_cols (set): Feature columns of the published handler.
+        label_cols (set): Label columns of the published handler.
+        prediction_cols (list): Prediction columns of the published handler.
+    """
+    segment: str
+    num_rows: int
+    columns: tuple
+    index: tuple
+    feature_cols: set = field(default_factory=set)
+    label_cols: set = field(default_factory=set)
+    prediction_cols: list = None
+
+
+class SharedMemoryPublisher:
+    """
+    Publishes DataHandler frames into OS shared memory and owns the lifecycle of the segments.
+
+    Numeric and datetime columns are copied once into the segment, object and categorical columns
+    are stored as integer category codes. Columns of any other type are skipped.
+    Workers therefore see object (e.g. string) columns as pandas `Categorical` columns with the same values.
+    All segments are unlinked by `close()`, when leaving the context manager or at interpreter exit;
+    a closed publisher no longer holds an exit handler and can be collected.
+
+    Example:
+        with SharedMemoryPublisher() as publisher:
+            spec = publisher.publish(wrapper.data_handler)
+            pool.map(work, [spec] * n)
+    """
+
+    alignment = 64
+
+    def __init__(self):
+        self.segments = []
+        atexit.register(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def publish(self, handler: DataHandler) -> SharedFrameSpec:
+        """
+        Copies the frame of the handler into a new shared memory segment.
+
+        Args:
+            handler (DataHandler): Handler whose DataFrame should be shared.
+
+        Returns:
+            SharedFrameSpec: Description workers pass to `SharedDataHandler.attach`.
+        """
+        df = handler.get_dataframe()
+        buffers = []
+        layout = []
+        offset = 0
+
+        for name in df.columns:
+            stored = self._encode_column(df[name])
+            if stored is None:
+                print(f"Column {name} of type {df[name].dtype} cannot be shared and is skipped")
+                continue
+            kind, values, categories = stored
+            offset = -(-offset // self.alignment) * self.alignment
+            layout.append(SharedColumn(name, kind, values.dtype.str, offset, categories))
+            buffers.append((offset, values))
+            offset += values.nbytes
+
+        index = df.index
+        if isinstance(index, pd.RangeIndex):
+            index_spec = ('range', index.start, index.stop, index.step)
+        elif pd.api.types.is_numeric_dtype(index.dtype):
+            values = np.ascontiguousarray(index.to_numpy())
+            offset = -(-offset // self.alignment) * self.alignment
+            index_spec = ('segment', values.dtype.str, offset)
+            buffers.append((offset, values))
+            offset += values.nbytes
+        else:
+            index_spec = ('values', index.tolist())
+
+        segment = SharedMemory(create=True, size=max(offset, 1))
+        self.segments.append(segment)
+        for start, values in buffers:
+            target = np.ndarray(values.shape, dtype=values.dtype, buffer=segment.buf, offset=start)
+            target[:] = values
+
+        return SharedFrameSpec(segment=segment.name, num_rows=len(df), columns=tuple(layout), index=index_spec,
+                               feature_cols=set(handler.feature_cols), label_cols=set(handler.label_cols),
+                               prediction_cols=list(handler.prediction_cols) if handler.prediction_cols else None)
+
+    def close(self):
+        """
+        Closes and unlinks every segment created by this publisher.
+        """
+        atexit.unregister(self.close)
+        while self.segments:
+            segment = self.segments.pop()
+            segment.close()
+            try:
+                segment.unlink()
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _encode_column(series: pd.Series):
+        dtype = series.dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            return 'categorical', np.ascontiguousarray(series.cat.codes.to_numpy()), dtype.categories.tolist()
+        if pd.api.types.is_datetime64_ns_dtype(dtype) and getattr(dtype, 'tz', None) is None:
+            return 'datetime', np.ascontiguousarray(series.to_numpy().view('int64')), None
+        if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_numeric_dtype(dtype):
+            if isinstance(dtype, np.dtype):
+                return 'numeric', np.ascontiguousarray(series.to_numpy()), None
+            return None
+        if dtype == object or pd.api.types.is_string_dtype(dtype):
+            try:
+                codes, uniques = pd.factorize(series)
+            except TypeError:
+                return None
+            codes = codes.astype(np.int32 if len(uniques) >= np.iinfo(np.int16).max else np.int16)
+            return 'categorical', codes, uniques.tolist()
+        return None
+
+
+class SharedDataHandler(DataHandler):
+    """
+    DataHandler whose DataFrame consists of zero-copy, read-only views on a shared memory segment.
+
+    Created in worker processes with `attach()`. Writing into the frame raises an error; use
+    `copy()` to obtain a private, writable DataHandler. Columns published from object dtype come back
+    as pandas `Categorical` columns.
+    """
+
+    def __init__(self, spec: SharedFrameSpec):
+        """
+        Attaches to the segment described by the spec and builds the DataFrame views.
+
+        Args:
+            spec (SharedFrameSpec): Description returned by `SharedMemoryPublisher.publish`.
+        """
+        self.segment = self._open_segment(spec)
+        buf = self.segment.buf
+
+        columns = {}
+        for col in spec.columns:
+            values = np.ndarray((spec.num_rows,), dtype=np.dtype(col.dtype), buffer=buf, offset=col.offset)
+            values.flags.writeable = False
+            if col.kind == 'datetime':
+                columns[col.name] = values.view('datetime64[ns]')
+            elif col.kind == 'categorical':
+                columns[col.name] = pd.Categorical.from_codes(
+                    values, dtype=pd.CategoricalDtype(col.categories), validate=False)
+            else:
+                columns[col.name] = values
+
+        if spec.index[0] == 'range':
+            index = pd.RangeIndex(*spec.index[1:])
+        elif spec.index[0] == 'segment':
+            index_values = np.ndarray((spec.num_rows,), dtype=np.dtype(spec.index[1]), buffer=buf,
+                                      offset=spec.index[2])
+            index_values.flags.writeable = False
+            index = pd.Index(index_values, copy=False)
+        else:
+            index = pd.Index(spec.index[1])
+
+        dataframe = pd.DataFrame(columns, index=index, copy=False)
+        super().__init__(dataframe, spec.feature_cols, spec.label_cols,
+                         list(spec.prediction_cols) if spec.prediction_cols else None)
+
+    @classmethod
+    def attach(cls, spec: SharedFrameSpec) -> "SharedDataHandler":
+        """
+        Attaches to a published frame.
+
+        Args:
+            spec (SharedFrameSpec): Description returned by `SharedMemoryPublisher.publish`.
+
+        Returns:
+            SharedDataHandler: Handler backed by the shared segment.
+        """
+        return cls(spec)
+
+    def close(self):
+        """
+        Drops the views and detaches from the segment. Does not unlink it; that is the publisher's job.
+        """
+        self.dataframe = None
+        if self.segment is not None:
+            try:
+                self.segment.close()
+            except BufferError:
+                # Views derived from the frame are still alive; the mapping is released with them.
+                pass
+            self.segment = None
+
+    def __getstate__(self):
+        raise TypeError("SharedDataHandler cannot be pickled, pass its SharedFrameSpec to workers instead")
+
+    @staticmethod
+    def _open_segment(spec: SharedFrameSpec) -> SharedMemory:
+        # Pool workers share the resource tracker of their parent, so attaching never unlinks the segment.
+        if sys.version_info >= (3, 13):
+            return SharedMemory(name=spec.segment, track=False)
+        return SharedMemory(name=spec.segment)
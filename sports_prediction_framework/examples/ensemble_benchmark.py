@@ -0,0 +1,47 @@
+import time
+
+import numpy as np
+import pandas as pd
+import torch
+
+from sports_prediction_framework.model.torch_model.TorchFlat import TorchFlat
+from sports_prediction_framework.model.torch_model.TorchFlatEnsemble import TorchFlatEnsemble
+
+# Two synthetic double round-robin seasons of an 18-team league
+teams = 18
+pairs = [(h, a) for h in range(teams) for a in range(teams) if h != a]
+rng = np.random.default_rng(0)
+features = pd.DataFrame(pairs * 2, columns=['HID', 'AID'])
+labels = pd.DataFrame({'WDL': rng.integers(0, 3, len(features))})
+
+
+def make_model(seed: int, batch_size: int, epochs: int) -> TorchFlat:
+    torch.manual_seed(seed)
+    model = TorchFlat()
+    for key, value in {'embed_dim': 32, 'out_dim': 3, 'n_dense': 4, 'dense_dim': 64,
+                       'architecture_type': 'rectangle', 'batch_size': batch_size, 'epochs': epochs}.items():
+        setattr(model, key, value)
+    model.complex_init()
+    model.embedding = torch.nn.Embedding(teams, model.embed_dim)
+    return model
+
+
+epochs = 10
+# The first fits trigger lazy imports inside torch; keep them out of the measurements
+make_model(0, 64, 1).fit(features, labels)
+TorchFlatEnsemble([make_model(0, 64, 1)]).fit(features, labels)
+
+print(f"{'models':>7} {'batch':>6} {'loop s':>8} {'vmap s':>8} {'speedup':>8}")
+for batch_size in (9, 64):
+    for n_models in (1, 4, 16, 32):
+        models = [make_model(seed, batch_size, epochs) for seed in range(n_models)]
+        start = time.perf_counter()
+        for model in models:
+            model.fit(features, labels)
+        loop = time.perf_counter() - start
+
+        ensemble = TorchFlatEnsemble([make_model(seed, batch_size, epochs) for seed in range(n_models)])
+        start = time.perf_counter()
+        ensemble.fit(features, labels)
+        vectorized = time.perf_counter() - start
+        print(f"{n_models:7d} {batch_size:6d} {loop:8.2f} {vectorized:8.2f} {loop / vectorized:7.1f}x")
@@ -0,0 +1,24 @@
+import time
+
+import numpy as np
+import torch
+
+from sports_prediction_framework.utils.TeamStrengthGraph import TeamStrengthGraph
+
+# Updates of a single global graph with mini-batches of 9 matches between random teams
+rng = np.random.default_rng(0)
+batch = 9
+updates = 200
+
+print(f"{'teams':>6} {'edges':>8} {'ms/update':>10}")
+for teams in (20, 500, 3000):
+    graph = TeamStrengthGraph.Graph(teams, updates * batch)
+    home = torch.from_numpy(rng.integers(0, teams, (updates, batch)))
+    away = torch.from_numpy((home.numpy() + rng.integers(1, teams, (updates, batch))) % teams)
+    result = torch.from_numpy(rng.integers(0, 3, (updates, batch)))
+    start = time.perf_counter()
+    for i in range(updates):
+        graph.compute(home[i], away[i], result[i])
+        graph.edge_weight  # the weights are needed by every forward pass
+    elapsed = time.perf_counter() - start
+    print(f"{teams:6d} {graph.edge_index.shape[1]:8d} {elapsed / updates * 1000:10.3f}")
@@ -0,0 +1,60 @@
+import time
+
+import numpy as np
+import pandas as pd
+import torch
+
+from sports_prediction_framework.model.GNNModel import GNNModel
+from sports_prediction_framework.model.torch_model.TorchFlat import TorchFlat
+from sports_prediction_framework.model.torch_model.TorchGNN import TorchGNN
+from sports_prediction_framework.utils.TeamStrengthGraph import TeamStrengthGraph
+
+# Untrained models over an 18-team league; latency does not depend on the weights
+teams = 18
+rng = np.random.default_rng(0)
+pairs = np.array([(h, a) for h in range(teams) for a in range(teams) if h != a])
+
+flat = TorchFlat()
+for key, value in {'embed_dim': 32, 'out_dim': 3, 'n_dense': 4, 'dense_dim': 64,
+                   'architecture_type': 'rectangle'}.items():
+    setattr(flat, key, value)
+flat.complex_init()
+flat.embedding = torch.nn.Embedding(teams, flat.embed_dim)
+
+graph = TeamStrengthGraph(None)
+graph.graphs['League'] = TeamStrengthGraph.Graph(teams, len(pairs))
+for matchday in np.array_split(pairs, 34):
+    graph.graphs['League'].compute(matchday[:, 0], matchday[:, 1], rng.integers(0, 3, len(matchday)))
+gnn = TorchGNN(graph)
+for key, value in GNNModel.default_parameters.items():
+    setattr(gnn, key, value)
+gnn.complex_init()
+gnn.num_teams = teams
+gnn.embedding = torch.nn.Embedding(teams, gnn.embed_dim)
+
+
+def latency(func, repeats: int = 200) -> float:
+    for _ in range(10):
+        func()
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return np.median(times) * 1e6
+
+
+print(f"{'model':>6} {'matches':>8} {'eager us':>10} {'export us':>10} {'speedup':>8}")
+for name, model in (('flat', flat), ('gnn', gnn)):
+    exported = model.export()
+    for size in (1, len(pairs)):
+        rows = pairs[rng.integers(0, len(pairs), size)]
+        data = pd.DataFrame({'HID': rows[:, 0], 'AID': rows[:, 1], 'League': 'League'})
+        home, away = torch.from_numpy(rows[:, 0]), torch.from_numpy(rows[:, 1])
+        inputs = (home, away) if name == 'flat' else (gnn.graph_groups(data), home, away)
+        assert np.allclose(model.predict(data), exported(*inputs).numpy(), atol=1e-5)
+
+        eager = latency(lambda: model.predict(data))
+        with torch.no_grad():
+            scripted = latency(lambda: exported(*inputs))
+        print(f"{name:>6} {size:8d} {eager:10.1f} {scripted:10.1f} {eager / scripted:7.1f}x")
@@ -0,0 +1,45 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from sports_prediction_framework.datawrapper.DataHandler import DataHandler
+from sports_prediction_framework.datawrapper.DataWrapper import DataWrapper
+from sports_prediction_framework.learner.PredictionSink import PredictionSink
+from sports_prediction_framework.utils.Merger import Merger
+
+# Synthetic match table with float, date and string columns, some of them containing NaN
+rows = 50_000
+rng = np.random.default_rng(0)
+df = pd.DataFrame({
+    'MatchID': np.arange(rows),
+    'HID': rng.integers(0, 400, rows),
+    'AID': rng.integers(0, 400, rows),
+    'Date': pd.Timestamp('2000-01-01') + pd.to_timedelta(rng.integers(0, 8000, rows), unit='D'),
+    'League': rng.choice(['GER1', 'ENG1', 'ESP1', 'ITA1'], rows),
+    'Odds': np.where(rng.random(rows) < 0.05, np.nan, rng.uniform(1, 10, rows)),
+    'WDL': rng.integers(0, 3, rows),
+})
+parent = DataWrapper(DataHandler(df, feature_cols={'HID', 'AID'}, label_cols={'WDL'}))
+parent.total_set_of_teams_ids = set(range(400))
+
+
+def inner_predictions(seed: int) -> DataWrapper:
+    """Annotates the parent with the probabilities of one inner learner, predicting 80% of the rows."""
+    sink = PredictionSink(df.index)
+    predicted = np.random.default_rng(seed).random(rows) < 0.8
+    sink.write(pd.DataFrame(np.random.default_rng(seed).dirichlet(np.ones(3), predicted.sum()),
+                            index=df.index[predicted]))
+    return sink.annotate(parent)
+
+
+for n_learners in range(2, 9):
+    wrappers = [inner_predictions(seed) for seed in range(n_learners)]
+    print(f"{n_learners} inner learners")
+    for strategy in ('columns', 'index', 'key'):
+        merger = Merger(strategy)
+        start = time.perf_counter()
+        merged = merger.compute(wrappers, parent)
+        elapsed = time.perf_counter() - start
+        print(f"  {strategy:8s} {elapsed * 1000:9.1f} ms  {merged.get_dataframe().shape[0]:6d} rows  "
+              f"{merged.get_dataframe().shape[1]:3d} columns")
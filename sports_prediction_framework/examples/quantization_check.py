@@ -0,0 +1,69 @@
+import io
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import torch
+
+from sports_prediction_framework.datawrapper.DataHandler import DataHandler
+from sports_prediction_framework.datawrapper.SportType import SportType
+from sports_prediction_framework.learner.Tester import Tester
+from sports_prediction_framework.learner.Trainer import Trainer
+from sports_prediction_framework.model.FlatModel import FlatModel
+from sports_prediction_framework.transformer.Transformer import Transformer
+from sports_prediction_framework.utils.Evaluation import evaluate_metrics
+
+# Compares a trained FlatModel with its int8 dynamically quantized copy on held-out seasons.
+# Usage: python quantization_check.py [data.parquet] [dense_dim]
+path = sys.argv[1] if len(sys.argv) > 1 else "data.parquet"
+dense_dim = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+
+torch.manual_seed(0)
+dw = Transformer().transform(SportType.FOOTBALL.get_wrapper()(DataHandler(pd.read_parquet(path))))
+data = dw.get_dataframe()
+seasons = np.sort(data['Season'].unique())
+split = seasons[int(len(seasons) * 0.8)]
+train = dw.deepcopy(data[data['Season'] < split])
+test = dw.deepcopy(data[data['Season'] >= split])
+
+model = FlatModel({'embed_dim': 32, 'out_dim': 3, 'n_dense': 4, 'dense_dim': dense_dim,
+                   'architecture_type': 'rectangle', 'batch_size': 64, 'epochs': 20})
+Trainer(model).train(train)
+quantized = model.quantized()
+
+
+def evaluate(m: FlatModel) -> pd.DataFrame:
+    predictions = Tester(m).test(test)
+    return pd.concat([test.get_dataframe()[['WDL']], predictions], axis=1)
+
+
+def size(m: FlatModel) -> int:
+    buffer = io.BytesIO()
+    torch.save(m.model.state_dict(), buffer)
+    return buffer.tell()
+
+
+def throughput(m: FlatModel, repeats: int = 20) -> float:
+    features = test.get_dataframe()[m.in_cols]
+    m.predict(features)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        m.predict(features)
+    return repeats * len(features) / (time.perf_counter() - start)
+
+
+float_frame, int8_frame = evaluate(model), evaluate(quantized)
+difference = np.abs(float_frame[[0, 1, 2]].to_numpy() - int8_frame[[0, 1, 2]].to_numpy())
+agreement = (float_frame[[0, 1, 2]].to_numpy().argmax(1) == int8_frame[[0, 1, 2]].to_numpy().argmax(1)).mean()
+
+print(f"{len(test.get_dataframe())} test matches from season {split}, dense_dim {dense_dim}")
+print(f"max |p_float - p_int8|  {difference.max():.5f}")
+print(f"mean |p_float - p_int8| {difference.mean():.5f}")
+print(f"argmax agreement        {agreement:.4f}")
+print()
+metrics = pd.concat([evaluate_metrics(float_frame, 'macro')[0], evaluate_metrics(int8_frame, 'macro')[0]])
+metrics.index = ['float32', 'int8']
+metrics['size_kb'] = [size(model) / 1024, size(quantized) / 1024]
+metrics['matches/s'] = [throughput(model), throughput(quantized)]
+print(metrics.to_string(float_format=lambda value: f"{value:.5f}"))
@@ -0,0 +1,46 @@
+import time
+
+import numpy as np
+import pandas as pd
+import torch
+
+from sports_prediction_framework.model.torch_model.TorchFlat import TorchFlat
+
+# Synthetic double round-robin seasons of an 18-team league
+teams = 18
+pairs = [(h, a) for h in range(teams) for a in range(teams) if h != a]
+rng = np.random.default_rng(0)
+
+
+def season_data(seasons: int):
+    matches = pairs * seasons
+    features = pd.DataFrame(matches, columns=['HID', 'AID'])
+    labels = pd.DataFrame({'WDL': rng.integers(0, 3, len(features))})
+    return features, labels
+
+
+def make_model(batch_size: int, epochs: int, full_batch: bool = False) -> TorchFlat:
+    torch.manual_seed(0)
+    model = TorchFlat()
+    for key, value in {'embed_dim': 32, 'out_dim': 3, 'n_dense': 4, 'dense_dim': 64,
+                       'architecture_type': 'rectangle', 'batch_size': batch_size, 'epochs': epochs,
+                       'full_batch': full_batch}.items():
+        setattr(model, key, value)
+    model.complex_init()
+    model.embedding = torch.nn.Embedding(teams, model.embed_dim)
+    return model
+
+
+epochs = 20
+# The first fit triggers lazy imports inside torch; keep them out of the measurements
+make_model(64, 1).fit(*season_data(1))
+
+print(f"{'seasons':>8} {'rows':>6} {'batch':>6} {'epochs/s':>10}")
+for seasons in (1, 5):
+    features, labels = season_data(seasons)
+    for batch_size in (9, 64, 256, 'full'):
+        model = make_model(batch_size if batch_size != 'full' else 9, epochs, full_batch=batch_size == 'full')
+        start = time.perf_counter()
+        model.fit(features, labels)
+        elapsed = time.perf_counter() - start
+        print(f"{seasons:8d} {len(features):6d} {batch_size:>6} {epochs / elapsed:10.1f}")
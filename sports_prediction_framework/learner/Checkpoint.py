@@ -0,0 +1,137 @@
+import os
+import pickle
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import torch
+
+
+class Checkpointer:
+    """
+    Periodically stores the state of a running backtest in a local directory.
+
+    A checkpoint holds the learner state (trainers, testers and therefore models and their graphs,
+    plus the scope step of every learner), the predictions collected so far and the global Python,
+    NumPy and torch random generator states, so a resumed run continues as the original would have. The state is pickled
+    on the calling thread, so it is a consistent snapshot, and the bytes are written to disk by a
+    background thread, so training continues while the file is written. Files are written to a
+    temporary name and renamed, so a killed process never leaves a partial checkpoint behind.
+
+    Attributes:
+        directory (str): Directory the checkpoint files are written to.
+        every (int): Number of completed iterations between two checkpoints.
+        keep (int): Number of most recent checkpoint files kept on disk.
+    """
+
+    prefix = "checkpoint_"
+
+    def __init__(self, directory: str = "checkpoints", every: int = 1, keep: int = 2):
+        self.directory = directory
+        self.every = every
+        self.keep = keep
+        self.pending = []
+        self.writer = ThreadPoolExecutor(max_workers=1)
+
+    def due(self, step: int) -> bool:
+        """
+        Checks whether a checkpoint should be written after the given number of iterations.
+
+        Args:
+            step (int): Number of completed iterations.
+
+        Returns:
+            bool: True every `every` iterations.
+        """
+        return step > 0 and step % self.every == 0
+
+    def save(self, state, step: int):
+        """
+        Snapshots the state and schedules writing it to disk.
+
+        Args:
+            state: Picklable state, e.g. from `Learner.checkpoint_state()`.
+            step (int): Number of completed iterations, used to name the file.
+        """
+        random_state = (random.getstate(), np.random.get_state(), torch.get_rng_state())
+        payload = pickle.dumps((state, random_state), protocol=pickle.HIGHEST_PROTOCOL)
+        self._check_pending()
+        self.pending.append(self.writer.submit(self._write, payload, step))
+
+    def wait(self):
+        """
+        Blocks until all scheduled checkpoints are on disk.
+
+        Raises:
+            OSError: If writing a checkpoint failed.
+        """
+        while self.pending:
+            self.pending.pop(0).result()
+
+    def latest(self):
+        """
+        Returns the path of the most recent checkpoint.
+
+        Returns:
+            str or None: Path of the checkpoint file, or None if there is none.
+        """
+        files = self._files()
+        return os.path.join(self.directory, files[-1]) if files else None
+
+    def load(self):
+        """
+        Loads the most recent checkpoint, after waiting for pending writes, and restores the random generator states.
+
+        Returns:
+            object or None: The stored state, or None if there is no checkpoint.
+        """
+        self.wait()
+        path = self.latest()
+        if path is None:
+            return None
+        with open(path, 'rb') as f:
+            state, random_state = pickle.load(f)
+        random.setstate(random_state[0])
+        np.random.set_state(random_state[1])
+        torch.set_rng_state(random_state[2])
+        return state
+
+    def clear(self):
+        """
+        Removes all checkpoint files from the directory.
+        """
+        self.wait()
+        for filename in self._files():
+            os.remove(os.path.join(self.directory, filename))
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['pending'] = []
+        state['writer'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.writer = ThreadPoolExecutor(max_workers=1)
+
+    def _write(self, payload: bytes, step: int):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{self.prefix}{step:06d}.pkl")
+        tmp = path + ".tmp"
+        with open(tmp, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        for filename in self._files()[:-self.keep]:
+            os.remove(os.path.join(self.directory, filename))
+
+    def _files(self) -> list:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(f for f in os.listdir(self.directory) if f.startswith(self.prefix) and f.endswith(".pkl"))
+
+    def _check_pending(self):
+        # Surface errors of finished writes early instead of only at the end of the run
+        while self.pending and self.pending[0].done():
+            self.pending.pop(0).result()
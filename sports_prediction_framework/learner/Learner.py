@@ -1,9 +1,15 @@
+import numpy as np
 import pandas as pd
 from sports_prediction_framework.datawrapper.DataWrapper import DataWrapper
 from sports_prediction_framework.learner.Trainer import Trainer
 from sports_prediction_framework.learner.Tester import Tester
+from sports_prediction_framework.learner.PredictionSink import PredictionSink
+from sports_prediction_framework.learner.SplitExecutor import SplitExecutor
+from sports_prediction_framework.learner.Checkpoint import Checkpointer
 from sports_prediction_framework.transformer.DataSelector import DataSelector
 from sports_prediction_framework.utils.Merger import Merger
+from sports_prediction_framework.utils.Instrumentation import Instrumentation
+from sports_prediction_framework.utils.Profiler import Profiler
 
 
 class Learner:
@@ -25,33 +31,35 @@ class Learner:
         self.scope = scope
         self.last = True
 
+    @Profiler.profile("Learner.compute")
+    @Instrumentation.span("Learner.compute")
     def compute(self, wrapper: DataWrapper) -> DataWrapper:
         """
         Executes the train-test workflow and attaches predictions to the wrapper.
 
+        Predictions are collected in a `PredictionSink` sized to the wrapper and attached once at the end.
+        A row predicted more than once keeps its first prediction.
+
         Args:
             wrapper (DataWrapper): Dataset to train/test on.
 
         Returns:
-            DataWrapper: Copy of the input wrapper with added predictions.
+            DataWrapper: Copy of the input wrapper with added predictions. The original columns are shared, not copied.
         """
-        features = self.train_test(wrapper)
-        if features is None:
+        sink = PredictionSink(wrapper.get_dataframe().index)
+        self.train_test(wrapper, sink)
+        if self.tester is None:
             return wrapper
-        features = features[~features.index.duplicated(keep='first')]
-        pwrapper = wrapper.deepcopy()
-        if self.last:
-            pwrapper.add_predictions(features)
-        else:
-            pwrapper.add_features(features)
-        return pwrapper
+        return sink.annotate(wrapper, as_predictions=self.last)
 
-    def train_test(self, dataset: DataWrapper) -> pd.DataFrame:
+    @Instrumentation.span("Learner.train_test")
+    def train_test(self, dataset: DataWrapper, sink: PredictionSink = None) -> pd.DataFrame:
         """
         Performs the train-test split, fits the model, and returns predictions.
 
         Args:
             dataset (DataWrapper): Complete dataset.
+            sink (PredictionSink, optional): Sink the predictions are written into.
 
         Returns:
             pd.DataFrame: Predictions from the test set.
@@ -62,7 +70,11 @@ class Learner:
             return pd.DataFrame()
         self.train(train_wrapper)
 
-        return self.test(test_wrapper)
+        # Planned test rows are written by position, otherwise the sink looks them up by label
+        positions = None
+        if sink is not None and sink.aligned(dataset):
+            positions = self.scope.test_positions(dataset)
+        return self.test(test_wrapper, sink, positions)
 
     def train(self, dataset: DataWrapper):
         """
@@ -80,12 +92,14 @@ class Learner:
             else:
                 raise ValueError("Missing data!")
 
-    def test(self, dataset: DataWrapper) -> pd.DataFrame:
+    def test(self, dataset: DataWrapper, sink: PredictionSink = None, positions: np.ndarray = None) -> pd.DataFrame:
         """
         Tests the model using the provided dataset and returns predictions.
 
         Args:
             dataset (DataWrapper): Testing data.
+            sink (PredictionSink, optional): Sink the predictions are written into.
+            positions (np.ndarray, optional): Row positions of the testing data in the sink's dataset.
 
         Returns:
             pd.DataFrame: Model predictions.
@@ -95,7 +109,7 @@ class Learner:
         """
         if self.tester is not None:
             if not dataset.get_dataframe().empty:
-                return self.tester.test(dataset)
+                return self.tester.test(dataset, sink, positions)
             else:
                 raise ValueError("Missing data!")
         return None
@@ -122,6 +136,45 @@ class Learner:
         """
         self.scope.update()
 
+    def materialize_splits(self, wrapper: DataWrapper):
+        """
+        Precomputes the train/test split plan of the DataSelector for the dataset.
+
+        Subsequent runs on the same dataset take their subsets from the plan instead of re-running the selectors.
+
+        Args:
+            wrapper (DataWrapper): Dataset the learner will be computed on.
+        """
+        if self.scope is not None:
+            self.scope.materialize(wrapper)
+
+    def checkpoint_state(self) -> dict:
+        """
+        Returns the state needed to continue a run: trainer, tester (with their models) and the scope step.
+
+        Returns:
+            dict: Picklable learner state.
+        """
+        return {
+            'trainer': self.trainer,
+            'tester': self.tester,
+            'step': self.scope.step if self.scope is not None else None,
+        }
+
+    def restore_state(self, state: dict):
+        """
+        Restores a state returned by `checkpoint_state()`, replaying the scope up to the stored step.
+
+        Args:
+            state (dict): Stored learner state.
+        """
+        self.trainer = state['trainer']
+        self.tester = state['tester']
+        if self.scope is not None and state['step'] is not None:
+            self.scope.reset_state()
+            for _ in range(state['step']):
+                self.scope.update()
+
 
 class LearnerWithoutScope(Learner):
     """
@@ -138,18 +191,22 @@ class LearnerWithoutScope(Learner):
         """
         super().__init__(trainer, tester, None, **kwargs)
 
-    def train_test(self, dataset: DataWrapper) -> pd.DataFrame:
+    def train_test(self, dataset: DataWrapper, sink: PredictionSink = None) -> pd.DataFrame:
         """
         Trains and tests the model on the same dataset.
 
         Args:
             dataset (DataWrapper): Full dataset.
+            sink (PredictionSink, optional): Sink the predictions are written into.
 
         Returns:
             pd.DataFrame: Predictions.
         """
         self.train(dataset)
-        return self.test(dataset)
+        positions = None
+        if sink is not None and sink.aligned(dataset):
+            positions = np.arange(len(dataset.get_dataframe()))
+        return self.test(dataset, sink, positions)
 
 
 class UpdatingLearner(Learner):
@@ -163,7 +220,11 @@ class UpdatingLearner(Learner):
         trainer: Trainer = None,
         tester: Tester = None,
         scope: DataSelector = None,
-        learners: list = None
+        learners: list = None,
+        parallel: str = None,
+        n_jobs: int = None,
+        seed: int = 0,
+        checkpointer: Checkpointer = None
     ):
         """
         Initializes the UpdatingLearner.
@@ -173,42 +234,159 @@ class UpdatingLearner(Learner):
             tester (Tester): Tester component.
             scope (DataSelector): DataSelector for iterative training/testing.
             learners (list): Optional list of nested Learner instances to coordinate.
+            parallel (str, optional): 'thread' or 'process' to run the iterations as independent splits on a
+                worker pool (see `SplitExecutor`). Each split trains a freshly reset clone of the model.
+                'process' is deterministic for every model; 'thread' only accepts models that do not draw
+                from the global random generators, e.g. scikit-learn estimators with a fixed `random_state`.
+                By default iterations run sequentially and the model is carried over between them.
+            n_jobs (int, optional): Number of workers in parallel mode. Defaults to the number of CPUs.
+            seed (int, optional): Base seed of the per-split random generators in process mode.
+            checkpointer (Checkpointer, optional): Writes the state of the run every few iterations so it can
+                be continued with `resume()`.
+
+        Raises:
+            ValueError: If parallel mode is combined with inner learners, a warm-starting trainer or checkpointing.
         """
         self.learners = learners if isinstance(learners, list) else ([learners] if learners else [])
-        self.merger = Merger() if self.learners else None
+        self.merger = Merger(strategy='index') if self.learners else None
+        if parallel is not None and self.learners:
+            raise ValueError("Parallel execution requires independent iterations and cannot use inner learners")
+        if parallel is not None and trainer is not None and trainer.warm_start:
+            raise ValueError("Parallel execution trains every split from scratch and cannot warm-start")
+        if parallel is not None and checkpointer is not None:
+            raise ValueError("Parallel execution does not support checkpointing")
+        self.checkpointer = checkpointer
+        self.executor = SplitExecutor(parallel, n_jobs, seed) if parallel is not None else None
         super().__init__(trainer, tester, scope)
 
-    def train_test(self, wrapper: DataWrapper):
+    @Instrumentation.span("UpdatingLearner.train_test")
+    def train_test(self, wrapper: DataWrapper, sink: PredictionSink = None):
         """
         Iteratively trains and tests as long as the scope condition holds.
         If inner learners are provided, they are run in parallel and their predictions merged.
 
         Args:
             wrapper (DataWrapper): Full dataset.
+            sink (PredictionSink, optional): Sink every iteration writes its predictions into.
+                A sink for the wrapper is created when omitted.
 
         Returns:
-            pd.DataFrame: Concatenated predictions from all iterations.
-        """
-        outputs = []
-        copy = wrapper.deepcopy()
-        # iteratively check if still within dataset scope
-        while self.scope.holds():
-            if self.learners:
-                wrappers = []
-                for learner in self.learners:
-                    wrappers.append(learner.compute(copy))
-                    learner.update()
-                wrapper = self.merger.compute(wrappers)
-            outputs.append(super().train_test(wrapper))
-            self.update()
+            pd.DataFrame: Predictions of all iterations in dataset order, the first prediction of each row.
+        """
+        if sink is None:
+            sink = PredictionSink(wrapper.get_dataframe().index)
+
+        if self.executor is not None:
+            aligned = sink.aligned(wrapper)
+            for rows, output in self.executor.run(self.trainer, self.tester, wrapper, self.scope.iter_splits(wrapper)):
+                sink.write(output, rows if aligned else None)
+                Instrumentation.count("splits")
+        else:
+            base = wrapper
+            try:
+                # iteratively check if still within dataset scope
+                while self.scope.holds():
+                    if self.learners:
+                        wrappers = []
+                        for learner in self.learners:
+                            wrappers.append(learner.compute(base))
+                            learner.update()
+                        wrapper = self.merger.compute(wrappers, base)
+                    super().train_test(wrapper, sink)
+                    Instrumentation.count("splits")
+                    self.update()
+                    if self.checkpointer is not None and self.checkpointer.due(self.scope.step):
+                        self.checkpointer.save({'learner': self.checkpoint_state(), 'sink': sink}, self.scope.step)
+            finally:
+                if self.checkpointer is not None:
+                    self.checkpointer.wait()
 
         if self.tester is not None:
-            if len(outputs) == 0:
-                return pd.DataFrame()
-            features = pd.concat([data for data in outputs])
-            return features
+            return sink.to_frame()
         return None
 
+    def compute(self, wrapper: DataWrapper) -> DataWrapper:
+        """
+        Executes the train-test workflow from the start and attaches predictions to the wrapper.
+
+        Checkpoints of an earlier run in the checkpointer's directory are removed first.
+
+        Args:
+            wrapper (DataWrapper): Dataset to train/test on.
+
+        Returns:
+            DataWrapper: Copy of the input wrapper with added predictions.
+        """
+        if self.checkpointer is not None:
+            self.checkpointer.clear()
+        return super().compute(wrapper)
+
+    def resume(self, wrapper: DataWrapper) -> DataWrapper:
+        """
+        Continues a run from its last checkpoint, or starts it if there is none.
+
+        Models, graphs and predictions are restored from the checkpoint, the scopes are replayed up to the
+        last completed iteration, and the run continues from there.
+
+        Args:
+            wrapper (DataWrapper): The dataset the checkpointed run was computed on.
+
+        Returns:
+            DataWrapper: Copy of the input wrapper with the predictions of the whole run.
+
+        Raises:
+            ValueError: If the learner has no checkpointer or the checkpoint belongs to another dataset.
+        """
+        if self.checkpointer is None:
+            raise ValueError("resume() requires a checkpointer")
+        checkpoint = self.checkpointer.load()
+        if checkpoint is None:
+            return self.compute(wrapper)
+
+        sink = checkpoint['sink']
+        if not sink.index.equals(wrapper.get_dataframe().index):
+            raise ValueError("The checkpoint was written for a different dataset")
+        # Equal to the wrapper's index, share it so the run continues writing by position
+        sink.index = wrapper.get_dataframe().index
+        self.restore_state(checkpoint['learner'])
+        self.train_test(wrapper, sink)
+        if self.tester is None:
+            return wrapper
+        return sink.annotate(wrapper, as_predictions=self.last)
+
+    def checkpoint_state(self) -> dict:
+        """
+        Returns the state of this learner and all inner learners.
+
+        Returns:
+            dict: Picklable learner state.
+        """
+        state = super().checkpoint_state()
+        state['learners'] = [learner.checkpoint_state() for learner in self.learners]
+        return state
+
+    def restore_state(self, state: dict):
+        """
+        Restores the state of this learner and all inner learners.
+
+        Args:
+            state (dict): Stored learner state.
+        """
+        super().restore_state(state)
+        for learner, learner_state in zip(self.learners, state['learners']):
+            learner.restore_state(learner_state)
+
+    def materialize_splits(self, wrapper: DataWrapper):
+        """
+        Precomputes the split plans of this learner and all inner learners for the dataset.
+
+        Args:
+            wrapper (DataWrapper): Dataset the learner will be computed on.
+        """
+        for learner in self.learners:
+            learner.materialize_splits(wrapper)
+        super().materialize_splits(wrapper)
+
     def reset_state(self):
         """
         Resets state of all inner learners, the scope, and the trainer.
@@ -0,0 +1,166 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+from sports_prediction_framework.datawrapper.DataWrapper import DataWrapper
+from sports_prediction_framework.utils.Instrumentation import Instrumentation
+
+
+class PredictionSink:
+    """
+    Preallocated buffer collecting the predictions of a learner for every row of a dataset.
+
+    The buffer is a single array with one row per dataset row, allocated on the first write once the
+    prediction columns are known. Testers write into it by row position; a row keeps the first prediction
+    written to it. At the end the dataset is annotated once with `annotate()`, which shares the existing
+    columns instead of deep-copying them.
+
+    Attributes:
+        index (pd.Index): Index of the dataset the predictions belong to.
+        dtype (np.dtype): Dtype of the buffer for numeric predictions.
+        columns (pd.Index): Prediction columns, known after the first write.
+        values (np.ndarray): Buffer of shape (rows, columns), unwritten rows hold NaN.
+        written (np.ndarray): Boolean mask of the rows that hold a prediction.
+    """
+
+    def __init__(self, index: pd.Index, dtype=np.float32):
+        """
+        Creates an empty sink for a dataset.
+
+        Args:
+            index (pd.Index): Index of the dataset; must be unique.
+            dtype (np.dtype, optional): Dtype of the buffer. Defaults to float32.
+
+        Raises:
+            ValueError: If the index contains duplicate labels.
+        """
+        if not index.is_unique:
+            raise ValueError("PredictionSink requires a dataset with a unique index")
+        self.index = index
+        self.dtype = np.dtype(dtype)
+        self.columns = None
+        self.values = None
+        self.written = np.zeros(len(index), dtype=bool)
+
+    def __len__(self):
+        return int(self.written.sum())
+
+    def positions(self, labels: pd.Index) -> np.ndarray:
+        """
+        Translates index labels into row positions of the dataset.
+
+        Args:
+            labels (pd.Index): Labels to look up.
+
+        Returns:
+            np.ndarray: Row positions, -1 for labels not in the dataset.
+        """
+        return self.index.get_indexer(labels)
+
+    def aligned(self, wrapper: DataWrapper) -> bool:
+        """
+        Checks whether the sink was created for the wrapper's index, so row positions in the wrapper
+        are row positions of the sink. Only the identity of the index is compared.
+
+        Args:
+            wrapper (DataWrapper): Dataset the positions refer to.
+
+        Returns:
+            bool: True if positions can be written directly.
+        """
+        return wrapper.get_dataframe().index is self.index
+
+    def write(self, predictions: pd.DataFrame, positions: np.ndarray = None):
+        """
+        Stores predictions at the given row positions. Rows that already hold a prediction are kept.
+
+        Args:
+            predictions (pd.DataFrame): Predictions, one row per dataset row.
+            positions (np.ndarray, optional): Row position of each prediction. Looked up from the
+                index of `predictions` when omitted; rows not in the dataset are ignored.
+        """
+        if predictions is None or predictions.empty:
+            return
+        if positions is None:
+            positions = self.positions(predictions.index)
+        columns = self._column_positions(predictions)
+
+        keep = positions >= 0
+        keep[keep] = ~self.written[positions[keep]]
+        # Of repeated positions within one write only the first counts
+        _, first = np.unique(positions, return_index=True)
+        unique = np.zeros(len(positions), dtype=bool)
+        unique[first] = True
+        keep &= unique
+        if not keep.any():
+            return
+
+        rows = positions[keep]
+        values = predictions.to_numpy()[keep]
+        if columns is None:
+            self.values[rows] = values
+        else:
+            self.values[rows[:, None], columns] = values
+        self.written[rows] = True
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Returns the written predictions in dataset order.
+
+        Returns:
+            pd.DataFrame: Predictions of every written row.
+        """
+        if self.values is None:
+            return pd.DataFrame()
+        rows = np.flatnonzero(self.written)
+        return pd.DataFrame(self.values[rows], index=self.index[rows], columns=self.columns)
+
+    @Instrumentation.span("PredictionSink.annotate")
+    def annotate(self, wrapper: DataWrapper, as_predictions: bool = True) -> DataWrapper:
+        """
+        Returns a wrapper holding the dataset plus the prediction columns.
+
+        The input wrapper is left unchanged. Its columns are shared with the result rather than copied,
+        rows without a prediction hold NaN.
+
+        Args:
+            wrapper (DataWrapper): Dataset the sink was created for.
+            as_predictions (bool): Register the new columns as predictions, otherwise as features.
+
+        Returns:
+            DataWrapper: Annotated wrapper.
+        """
+        handler = wrapper.data_handler
+        dataframe = handler.dataframe
+        new_columns = []
+        if self.values is not None:
+            predictions = pd.DataFrame(self.values, index=dataframe.index, columns=self.columns, copy=False)
+            dataframe = pd.concat([dataframe, predictions], axis=1, copy=False)
+            new_columns = self.columns.tolist()
+
+        annotated = copy.copy(wrapper)
+        annotated.data_handler = handler.copy(dataframe)
+        if as_predictions:
+            annotated.data_handler.prediction_cols = new_columns
+        else:
+            annotated.data_handler.feature_cols.update(new_columns)
+        return annotated
+
+    def _column_positions(self, predictions: pd.DataFrame):
+        if self.values is None:
+            numeric = all(pd.api.types.is_numeric_dtype(dtype) for dtype in predictions.dtypes)
+            self.columns = predictions.columns
+            self.values = np.full((len(self.index), len(self.columns)), np.nan,
+                                  dtype=self.dtype if numeric else object)
+            return None
+        if predictions.columns.equals(self.columns):
+            return None
+
+        # Predictions with columns not seen before (e.g. a class missing from an earlier window) widen the buffer
+        missing = predictions.columns.difference(self.columns, sort=False)
+        if len(missing):
+            self.columns = self.columns.append(missing)
+            padding = np.full((len(self.index), len(missing)), np.nan, dtype=self.values.dtype)
+            self.values = np.hstack([self.values, padding])
+        return self.columns.get_indexer(predictions.columns)
@@ -0,0 +1,136 @@
+import copy
+import os
+import random
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import torch
+
+from sports_prediction_framework.datawrapper.DataWrapper import DataWrapper
+from sports_prediction_framework.datawrapper.SharedDataHandler import SharedMemoryPublisher, SharedDataHandler
+from sports_prediction_framework.learner.Trainer import Trainer
+from sports_prediction_framework.learner.Tester import Tester
+
+
+class SplitExecutor:
+    """
+    Runs independent train/test splits on a thread or process pool and gathers the predictions in split order.
+
+    Every split is trained by its own clone of the trainer and tester, reset to an untrained state,
+    so the predictions do not depend on the number of workers or on scheduling:
+
+    - 'process' (default): deterministic for all models. With a seed, each worker seeds the global
+      random generators with `seed + split number` before it resets its clone. The dataset is published
+      once to shared memory and workers attach to it instead of receiving a pickled copy.
+    - 'thread': workers share the global random generators, so this backend only accepts models that do
+      not draw from them (see `Model.uses_global_random()`), e.g. scikit-learn estimators with a fixed
+      `random_state`. The seed is not used.
+
+    Attributes:
+        backend (str): 'thread' or 'process'.
+        n_jobs (int): Number of workers.
+        seed (int): Base seed of the per-split random generators, or None to leave them untouched.
+    """
+
+    backends = ('thread', 'process')
+
+    def __init__(self, backend: str = 'process', n_jobs: int = None, seed: int = 0):
+        if backend not in self.backends:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {self.backends}")
+        self.backend = backend
+        self.n_jobs = n_jobs if n_jobs is not None else os.cpu_count()
+        self.seed = seed
+
+    def run(self, trainer: Trainer, tester: Tester, wrapper: DataWrapper, splits) -> list:
+        """
+        Trains and tests every split and returns the predictions with their test rows in the order of the splits.
+
+        Splits are consumed lazily; at most twice as many splits as workers are in flight.
+
+        Args:
+            trainer (Trainer): Template trainer, cloned for every split and left unchanged.
+            tester (Tester): Template tester, cloned together with the trainer.
+            wrapper (DataWrapper): Full dataset the split row positions refer to.
+            splits (Iterable[Split]): Splits to run, e.g. `DataSelector.iter_splits(wrapper)`.
+
+        Returns:
+            list[tuple[np.ndarray, pd.DataFrame]]: Test row positions and predictions of each non-empty split.
+
+        Raises:
+            ValueError: In thread mode, if the model draws from the global random generators.
+        """
+        if self.backend == 'process':
+            with SharedMemoryPublisher() as publisher:
+                spec = publisher.publish(wrapper.data_handler)
+                attributes = {k: v for k, v in wrapper.__dict__.items() if k != 'data_handler'}
+                with ProcessPoolExecutor(max_workers=self.n_jobs, initializer=_init_process,
+                                         initargs=(max(1, torch.get_num_threads() // self.n_jobs),)) as pool:
+                    return self._gather(pool, splits, lambda step, split: pool.submit(
+                        _run_shared_split, trainer, tester, spec, wrapper.__class__, attributes,
+                        split.train_rows, split.test_rows, self._seed(step)))
+
+        for model in {id(component.model): component.model for component in (trainer, tester)}.values():
+            if model is not None and model.uses_global_random():
+                raise ValueError(f"{type(model).__name__} draws from the global random generators and cannot "
+                                 f"be trained deterministically on threads, use the 'process' backend")
+        data = wrapper.get_dataframe()
+        with ThreadPoolExecutor(max_workers=self.n_jobs) as pool:
+            return self._gather(pool, splits, lambda step, split: pool.submit(
+                _run_split, trainer, tester, wrapper.deepcopy(data.take(split.train_rows)),
+                wrapper.deepcopy(data.take(split.test_rows))))
+
+    def _gather(self, pool, splits, submit) -> list:
+        outputs = []
+        pending = deque()
+        for step, split in enumerate(splits):
+            if len(split.train_rows) == 0 or len(split.test_rows) == 0:
+                continue
+            pending.append((split.test_rows, submit(step, split)))
+            if len(pending) >= 2 * self.n_jobs:
+                rows, future = pending.popleft()
+                outputs.append((rows, future.result()))
+        while pending:
+            rows, future = pending.popleft()
+            outputs.append((rows, future.result()))
+        return outputs
+
+    def _seed(self, step: int):
+        return None if self.seed is None else self.seed + step
+
+
+def _init_process(num_threads: int):
+    torch.set_num_threads(num_threads)
+
+
+def _seed_everything(seed: int):
+    random.seed(seed)
+    np.random.seed(seed)
+    torch.manual_seed(seed)
+
+
+def _run_split(trainer: Trainer, tester: Tester, train: DataWrapper, test: DataWrapper) -> pd.DataFrame:
+    # Copy trainer and tester together so a model shared between them stays shared
+    trainer, tester = copy.deepcopy((trainer, tester))
+    trainer.reset_state()
+    trainer.train(train)
+    return tester.test(test)
+
+
+def _run_shared_split(trainer: Trainer, tester: Tester, spec, wrapper_class, attributes: dict,
+                      train_rows: np.ndarray, test_rows: np.ndarray, seed) -> pd.DataFrame:
+    # Only worker processes own their global random generators
+    if seed is not None:
+        _seed_everything(seed)
+    handler = SharedDataHandler.attach(spec)
+    try:
+        base = wrapper_class(handler)
+        base.__dict__.update(attributes)
+        data = base.get_dataframe()
+        train = base.deepcopy(data.take(train_rows))
+        test = base.deepcopy(data.take(test_rows))
+        del base, data
+    finally:
+        handler.close()
+    return _run_split(trainer, tester, train, test)
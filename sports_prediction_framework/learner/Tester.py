@@ -1,5 +1,7 @@
 from sports_prediction_framework.model.Model import *
 from sports_prediction_framework.model.Scikit import *
+from sports_prediction_framework.learner.PredictionSink import PredictionSink
+from sports_prediction_framework.utils.Instrumentation import Instrumentation
 
 
 class Tester:
@@ -28,12 +30,16 @@ class Tester:
         """
         return self.test(dataset)
 
-    def test(self, wrapper: DataWrapper) -> pd.DataFrame:
+    @Instrumentation.span("Tester.test")
+    def test(self, wrapper: DataWrapper, sink: PredictionSink = None, positions: np.ndarray = None) -> pd.DataFrame:
         """
         Generates predictions from the model using the provided DataWrapper.
 
         Args:
             wrapper (DataWrapper): Dataset wrapper.
+            sink (PredictionSink, optional): Sink the predictions are also written into.
+            positions (np.ndarray, optional): Row position of every wrapper row in the sink's dataset.
+                The sink looks the rows up by index label when omitted.
 
         Returns:
             pd.DataFrame: Predictions indexed by the original dataset index.
@@ -44,6 +50,7 @@ class Tester:
             features = wrapper.get_features()
         else:
             features = wrapper.get_dataframe()[self.model.in_cols]
+        Instrumentation.count("rows.test", len(features))
 
         # Scikit-learn model specific handling
         if isinstance(self.model, ScikitModel):
@@ -60,9 +67,13 @@ class Tester:
                 # Use label columns from the wrapper if single-output
                 cols = wrapper.data_handler.label_cols
 
-            return pd.DataFrame(index=wrapper.get_dataframe().index, data=preds, columns=cols)
+            predictions = pd.DataFrame(index=wrapper.get_dataframe().index, data=preds, columns=cols)
         else:
             # For other model types, just convert predictions to DataFrame
             preds = self.model.predict(features)
-            return pd.DataFrame(index=wrapper.get_dataframe().index, data=preds)
+            predictions = pd.DataFrame(index=wrapper.get_dataframe().index, data=preds)
+
+        if sink is not None:
+            sink.write(predictions, positions)
+        return predictions
 
@@ -1,15 +1,33 @@
+import numpy as np
+
 from sports_prediction_framework.model.Model import *
 from sports_prediction_framework.datawrapper.DataWrapper import *
+from sports_prediction_framework.utils.Instrumentation import Instrumentation
+
+
 class Trainer:
 
-    def __init__(self, model: Model = None):
+    def __init__(self, model: Model = None, warm_start: bool = False, replay_fraction: float = 0.1, seed: int = 0):
         """
         Initialize the Trainer with a model instance.
 
+        In warm-start mode the model is trained from scratch only on the first window. On every later
+        window it continues from its previous state and is trained on the rows it has not seen yet plus a
+        random replay sample of the rows it has, so an expanding-window backtest costs roughly linear time.
+        How a model continues is decided by its `warm_start_fit()`.
+
         Args:
             model (Model, optional): The model to be trained.
+            warm_start (bool): Whether to continue training across windows instead of retraining.
+            replay_fraction (float): Share of previously seen rows replayed with the new rows in warm-start mode.
+            seed (int): Seed of the replay sampling.
         """
         self.model = model
+        self.warm_start = warm_start
+        self.replay_fraction = replay_fraction
+        self.seed = seed
+        self.seen_index = None
+        self.rng = np.random.default_rng(seed)
 
     def compute(self, dataset: DataWrapper):
         """
@@ -17,6 +35,7 @@ class Trainer:
         """
         self.train(dataset)
 
+    @Instrumentation.span("Trainer.train")
     def train(self, wrapper: DataWrapper):
         """
         Train the model using features and labels extracted from the wrapper.
@@ -33,10 +52,23 @@ class Trainer:
         self.model.set_parameters_from_wrapper(wrapper)
 
         # Fit the model on the selected features and labels
-        self.model.fit(features, wrapper.get_labels())
+        if self.warm_start and self.seen_index is not None:
+            new_rows = ~features.index.isin(self.seen_index)
+            fitted = self.model.warm_start_fit(features, wrapper.get_labels(), new_rows,
+                                               self.replay_fraction, self.rng)
+        else:
+            self.model.fit(features, wrapper.get_labels())
+            fitted = len(features)
+        # Rows actually fitted, i.e. new plus replayed rows in warm-start mode
+        Instrumentation.count("rows.train", fitted)
+
+        if self.warm_start:
+            self.seen_index = features.index
 
     def reset_state(self):
         """
-        Reset the internal state of the model (if any).
+        Reset the internal state of the model (if any) and forget the rows seen in warm-start mode.
         """
         self.model.reset_state()
+        self.seen_index = None
+        self.rng = np.random.default_rng(self.seed)
@@ -0,0 +1,107 @@
+from sports_prediction_framework.model.NeuralModel import NeuralModel
+from sports_prediction_framework.model.FlatModel import FlatModel
+from sports_prediction_framework.model.torch_model.TorchFlat import TorchFlat
+from sports_prediction_framework.model.torch_model.TorchFlatEnsemble import TorchFlatEnsemble
+from sports_prediction_framework.datawrapper.sport.MatchWrapper import MatchWrapper
+import numpy as np
+import pandas as pd
+import torch
+
+from typing import List, Optional, Sequence
+
+
+class FlatEnsembleModel(NeuralModel):
+    """
+    Ensemble of FlatModels with the same parameters, trained together in one vectorized pass.
+
+    Every member is initialized from its own seed and may use its own learning rate. Predictions are the
+    mean of the member probabilities; `members()` returns the fitted members as individual FlatModels.
+    """
+
+    def __init__(self, params: dict, seeds: Sequence[int] = (0, 1, 2, 3, 4), lrs: Optional[Sequence[float]] = None,
+                 pretrained_weights: Optional[torch.Tensor] = None, **kwargs) -> None:
+        """
+        Initialize the ensemble.
+
+        Args:
+            params (dict): Parameters shared by all members, as for FlatModel.
+            seeds (Sequence[int]): One seed per member, used for its initial weights.
+            lrs (Optional[Sequence[float]]): Learning rate per member. Defaults to the `lr` in params.
+            pretrained_weights (Optional[torch.Tensor]): Weights to initialize the embeddings of every member with.
+            **kwargs: Additional keyword arguments passed to the parent class initializer.
+        """
+        super().__init__(**kwargs)
+        if lrs is not None and len(lrs) != len(seeds):
+            raise ValueError("lrs must contain one learning rate per seed")
+        self.params = params
+        self.seeds = list(seeds)
+        self.lrs = list(lrs) if lrs is not None else None
+        self.pretrained_weights = pretrained_weights
+        self.reset_state()
+
+    def set_params(self, params: dict):
+        """
+        Set parameters on every member; per-member learning rates take precedence over `lr`.
+
+        Args:
+            params (dict): Parameter names and values.
+        """
+        for i, member in enumerate(self.model.members):
+            for key, value in params.items():
+                setattr(member, key, value)
+            if self.lrs is not None:
+                member.lr = self.lrs[i]
+        self.add_batch_columns(params)
+
+    def set_parameters_from_wrapper(self, wrapper: MatchWrapper) -> None:
+        """
+        Create the embeddings of every member from its own seed.
+
+        Args:
+            wrapper (MatchWrapper): The wrapper that contains the number of teams.
+        """
+        for seed, member in zip(self.seeds, self.model.members):
+            with torch.random.fork_rng():
+                torch.manual_seed(seed)
+                member.set_parameters_from_wrapper(wrapper)
+
+    def reset_state(self):
+        members = []
+        for seed in self.seeds:
+            with torch.random.fork_rng():
+                torch.manual_seed(seed)
+                member = TorchFlat(self.pretrained_weights)
+                for key, value in self.params.items():
+                    setattr(member, key, value)
+                member.complex_init()
+            members.append(member)
+        self.model = TorchFlatEnsemble(members)
+        self.set_params(self.params)
+
+    def predict_members(self, data: pd.DataFrame) -> np.ndarray:
+        """
+        Predict the probabilities of every member.
+
+        Args:
+            data (pd.DataFrame): Input features.
+
+        Returns:
+            np.ndarray: Probabilities of shape (members, rows, classes).
+        """
+        return self.model.predict_members(data)
+
+    def members(self) -> List[FlatModel]:
+        """
+        Return the fitted members as individual FlatModels.
+
+        The returned models share their networks with the ensemble.
+
+        Returns:
+            List[FlatModel]: One FlatModel per seed.
+        """
+        models = []
+        for member in self.model.members:
+            model = FlatModel(self.params, self.pretrained_weights)
+            model.model = member
+            models.append(model)
+        return models
@@ -1,6 +1,8 @@
 from sports_prediction_framework.model.NeuralModel import NeuralModel
 from sports_prediction_framework.model.torch_model.TorchFlat import TorchFlat
 from sports_prediction_framework.datawrapper.sport.MatchWrapper import MatchWrapper
+import copy
+
 import torch
 
 from typing import Optional
@@ -45,3 +47,19 @@ class FlatModel(NeuralModel):
 
         # Call the complex initialization of the model to set up the layers
         self.model.complex_init()
+
+    def quantized(self) -> 'FlatModel':
+        """
+        Return a copy of the fitted model with dynamically int8-quantized dense layers for CPU inference.
+
+        The weights of every Linear layer are stored as int8 and activations are quantized on the fly,
+        which makes the model smaller and bulk scoring faster on CPU. Embeddings stay float32. The copy is
+        meant for prediction only; training it again starts from a fresh float model. Use
+        `examples/quantization_check.py` to compare its probabilities and RPS against the float model.
+
+        Returns:
+            FlatModel: Quantized copy, the original model is unchanged.
+        """
+        model = copy.copy(self)
+        model.model = torch.ao.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+        return model
@@ -1,3 +1,5 @@
+import copy
+
 from torch.nn import LeakyReLU
 
 from sports_prediction_framework.datawrapper.sport.MatchWrapper import MatchWrapper
@@ -26,6 +28,24 @@ class GNNModel(NeuralModel):
     def set_parameters_from_wrapper(self, wrapper:MatchWrapper):
         self.model.set_parameters_from_wrapper(wrapper)
 
+    def warm_start_fit(self, features, labels, new_rows, replay_fraction, rng):
+        """
+        Continue from the current weights on the new rows only.
+
+        Old matches are not replayed, since training on them would add their edges to the graph again.
+        """
+        return super().warm_start_fit(features, labels, new_rows, 0.0, rng)
+
+    def snapshot(self, times=None):
+        """
+        Returns a copy of the model that predicts with the graphs as they were at the given times.
+
+        The weights are copied and the graph is replaced by `graph.snapshot(times)`, so the copy can be
+        evaluated, e.g. on another window in parallel, without touching this model or its graph.
+        """
+        graph = self.graph.snapshot(times)
+        return copy.deepcopy(self, {id(self.graph): graph})
+
     def get_train_scope(self, wrapper):
         min = wrapper.get_dataframe()[wrapper.season_column].min()
         window_selector = WindowSelector(ScopeExpander(wrapper,
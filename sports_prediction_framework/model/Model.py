@@ -49,6 +49,71 @@ class Model:
         """
         raise NotImplementedError
 
+    def warm_start_fit(self, features: pd.DataFrame, labels: pd.DataFrame, new_rows: np.ndarray,
+                       replay_fraction: float, rng: np.random.Generator) -> int:
+        """
+        Continue training an already fitted model on a grown training window.
+
+        The default implementation retrains on the whole window; subclasses override it to
+        reuse their fitted state.
+
+        Parameters
+        ----------
+        features : pd.DataFrame
+            Input features of the whole training window.
+        labels : pd.DataFrame
+            Target labels of the whole training window.
+        new_rows : np.ndarray
+            Boolean mask of the rows the model has not been trained on yet.
+        replay_fraction : float
+            Share of previously seen rows to replay together with the new rows.
+        rng : np.random.Generator
+            Random generator used to draw the replay sample.
+
+        Returns
+        -------
+        int
+            Number of rows the model was trained on.
+        """
+        self.fit(features, labels)
+        return len(features)
+
+    def uses_global_random(self) -> bool:
+        """
+        Whether fitting or predicting draws from the process-global random generators.
+
+        Such models cannot be trained deterministically on a thread pool, where all threads share
+        those generators. The default assumes they do.
+
+        Returns
+        -------
+        bool
+        """
+        return True
+
+    @staticmethod
+    def replay_rows(new_rows: np.ndarray, replay_fraction: float, rng: np.random.Generator) -> np.ndarray:
+        """
+        Select the new rows plus a random sample of the old rows, in their original order.
+
+        Parameters
+        ----------
+        new_rows : np.ndarray
+            Boolean mask of the rows not seen before.
+        replay_fraction : float
+            Share of old rows to include.
+        rng : np.random.Generator
+            Random generator used to draw the sample.
+
+        Returns
+        -------
+        np.ndarray
+            Sorted row positions to train on.
+        """
+        old = np.flatnonzero(~new_rows)
+        replay = rng.choice(old, size=int(round(len(old) * replay_fraction)), replace=False)
+        return np.sort(np.concatenate([np.flatnonzero(new_rows), replay]))
+
     def predict(self, data: pd.DataFrame) -> np.ndarray:
         """
         Generate predictions from the model for given input data.
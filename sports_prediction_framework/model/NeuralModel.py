@@ -10,8 +10,39 @@ class NeuralModel(Model):
     def __init__(self,**kwargs) -> None:
         super().__init__(**kwargs)
 
+    def set_params(self, params: dict):
+        super().set_params(params)
+        self.add_batch_columns(params)
+
+    def add_batch_columns(self, params: dict):
+        """
+        Add the columns of a `batch_column` parameter to the input columns, so they reach the training loop.
+        """
+        batch_column = params.get('batch_column')
+        if batch_column is None:
+            return
+        columns = [batch_column] if isinstance(batch_column, str) else list(batch_column)
+        self.in_cols = self.in_cols + [column for column in columns if column not in self.in_cols]
+
     def fit(self, features: pd.DataFrame, labels: pd.DataFrame):
         self.model.fit(features, labels)
 
+    def warm_start_fit(self, features: pd.DataFrame, labels: pd.DataFrame, new_rows: np.ndarray,
+                       replay_fraction: float, rng: np.random.Generator):
+        """
+        Continue from the current weights, training only on the new rows plus a replay sample of old rows.
+        """
+        if not new_rows.any():
+            return 0
+        rows = self.replay_rows(new_rows, replay_fraction, rng)
+        self.model.fit(features.iloc[rows], labels.iloc[rows])
+        return len(rows)
+
     def predict(self, data: pd.DataFrame, mode="test") -> np.ndarray:
-        return self.model.predict(data)
\ No newline at end of file
+        return self.model.predict(data)
+
+    def export(self, path: str = None):
+        """
+        Export the network as a frozen TorchScript module taking ID tensors, see `TorchModule.export`.
+        """
+        return self.model.export(path)
\ No newline at end of file
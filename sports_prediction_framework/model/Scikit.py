@@ -3,6 +3,7 @@ import sklearn
 from sklearn.base import is_classifier, is_regressor
 from sklearn.base import BaseEstimator
 from typing import Type
+from sports_prediction_framework.utils.Instrumentation import Instrumentation
 
 
 class ScikitModel(Model):
@@ -31,6 +32,7 @@ class ScikitModel(Model):
         self.scikit_model = model_class(**model_params)
         self.is_classifier = is_classifier(self.scikit_model)
 
+    @Instrumentation.span("ScikitModel.fit")
     def fit(self, features: pd.DataFrame, labels: pd.DataFrame):
         """
         Fit the scikit-learn model to the provided features and labels.
@@ -49,13 +51,70 @@ class ScikitModel(Model):
         AssertionError
             If the `labels` DataFrame does not contain exactly one column.
         """
+        self.scikit_model.fit(features, self._prepare_labels(labels))
+
+    def uses_global_random(self) -> bool:
+        """
+        Whether the estimator falls back to the global NumPy generator, i.e. has a `random_state` set to None.
+
+        Returns
+        -------
+        bool
+        """
+        params = self.scikit_model.get_params()
+        return any(key.split('__')[-1] == 'random_state' and value is None for key, value in params.items())
+
+    def warm_start_fit(self, features: pd.DataFrame, labels: pd.DataFrame, new_rows: np.ndarray,
+                       replay_fraction: float, rng: np.random.Generator) -> int:
+        """
+        Continue training the fitted estimator on a grown training window.
+
+        Estimators with `partial_fit` are updated with the new rows plus a replay sample of old rows.
+        Estimators with a `warm_start` parameter (except ensembles, which would not add any members)
+        are refitted on the whole window starting from their previous solution. All other estimators
+        are refitted from scratch.
+
+        Parameters
+        ----------
+        features : pd.DataFrame
+            Input features of the whole training window.
+        labels : pd.DataFrame
+            Target labels of the whole training window.
+        new_rows : np.ndarray
+            Boolean mask of the rows the estimator has not been trained on yet.
+        replay_fraction : float
+            Share of previously seen rows to replay with `partial_fit`.
+        rng : np.random.Generator
+            Random generator used to draw the replay sample.
+
+        Returns
+        -------
+        int
+            Number of rows the estimator was trained on.
+        """
+        params = self.scikit_model.get_params()
+        if hasattr(self.scikit_model, "partial_fit"):
+            if not new_rows.any():
+                return 0
+            rows = self.replay_rows(new_rows, replay_fraction, rng)
+            self.scikit_model.partial_fit(features.iloc[rows], self._prepare_labels(labels.iloc[rows]))
+            return len(rows)
+        if "warm_start" in params and "n_estimators" not in params:
+            self.scikit_model.set_params(warm_start=True)
+            self.fit(features, labels)
+            self.scikit_model.set_params(warm_start=params["warm_start"])
+        else:
+            self.fit(features, labels)
+        return len(features)
+
+    @staticmethod
+    def _prepare_labels(labels: pd.DataFrame) -> pd.Series:
         assert labels.shape[1] == 1
         if labels.shape[0] == 1:
-            labels = pd.Series(labels.squeeze())
-        else :
-            labels = labels.squeeze()
-        self.scikit_model.fit(features, labels)
+            return pd.Series(labels.squeeze())
+        return labels.squeeze()
 
+    @Instrumentation.span("ScikitModel.predict")
     def predict(self, data: pd.DataFrame) -> np.ndarray:
         """
         Make predictions on new data using the trained model.
@@ -1,3 +1,5 @@
+import copy
+
 import torch
 from torch import Tensor
 from torch.nn import Embedding, ModuleList, LogSoftmax, Dropout
@@ -84,39 +86,45 @@ class TorchFlat(TorchModule):
         if self.embedding is None:
             self.embedding = Embedding(wrapper.total_number_of_teams, self.embed_dim)
 
-    def get_features_batch(self, features: pd.DataFrame, batch_index: int) -> Tuple[pd.DataFrame, Tensor, Tensor]:
+    def prepare_tensors(self, features: pd.DataFrame, labels: pd.DataFrame) -> Tuple[Tuple, Tensor]:
         """
-        Retrieves a batch of home and away team IDs from the dataset.
+        Converts home and away team IDs and match results to tensors.
 
         :param features: The full features DataFrame
-        :param batch_index: Starting index of the batch
-        :return: A tuple (features_df, home_team_tensor, away_team_tensor)
+        :param labels: The full labels DataFrame or Series
+        :return: A tuple ((features_df, home_team_tensor, away_team_tensor), label_tensor)
         """
-        home = torch.from_numpy(
-            features.iloc[batch_index:batch_index + self.batch_size]['HID'].values.astype('int64'))
-        away = torch.from_numpy(
-            features.iloc[batch_index:batch_index + self.batch_size]['AID'].values.astype('int64'))
-        return features, home, away
+        home = torch.from_numpy(features['HID'].to_numpy(dtype='int64'))
+        away = torch.from_numpy(features['AID'].to_numpy(dtype='int64'))
+        result = torch.from_numpy(labels.to_numpy(dtype='int64').reshape(-1))
+        return (features, home, away), result
 
-    def get_labels_batch(self, labels: pd.DataFrame, batch_index: int) -> Tensor:
-        """
-        Retrieves a batch of match results as a tensor.
+    def model_specific_computation(self, batch, result):
+        pass
 
-        :param labels: The full labels DataFrame
-        :param batch_index: Starting index of the batch
-        :return: A tensor of labels for the batch
+    def inference_module(self) -> torch.nn.Module:
         """
+        Builds the serving module: (home IDs, away IDs) -> probabilities of shape [matches, out_dim].
+        """
+        return _FlatInference(self)
 
-        batch_end = min(batch_index + self.batch_size, len(labels))
-
-        result_slice = labels.iloc[batch_index:batch_end]
+    def example_inputs(self) -> Tuple[Tensor, Tensor]:
+        return torch.zeros(2, dtype=torch.long), torch.ones(2, dtype=torch.long)
 
-        # Convert the slice to a tensor
-        result = torch.from_numpy(result_slice.values.astype('int64').reshape(-1, ))
 
-        # Check the shape of the result
+class _FlatInference(torch.nn.Module):
+    """
+    Eval-mode copy of a TorchFlat network taking team ID tensors, used for export.
+    """
 
-        return result
+    def __init__(self, model: TorchFlat):
+        super().__init__()
+        self.embedding = copy.deepcopy(model.embedding)
+        self.lin_layers = copy.deepcopy(model.lin_layers)
+        self.activation = copy.deepcopy(model.activation)
 
-    def model_specific_computation(self, features, labels, j):
-        pass
+    def forward(self, team_home: Tensor, team_away: Tensor) -> Tensor:
+        x = torch.cat((self.embedding(team_home), self.embedding(team_away)), 1)
+        for layer in self.lin_layers:
+            x = self.activation(layer(x))
+        return torch.softmax(x, dim=1)
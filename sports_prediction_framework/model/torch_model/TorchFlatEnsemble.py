@@ -0,0 +1,168 @@
+import copy
+import math
+from typing import List
+
+import numpy as np
+import pandas as pd
+import torch
+from torch.func import functional_call, stack_module_state, vmap
+
+from sports_prediction_framework.model.torch_model.TorchFlat import TorchFlat
+from sports_prediction_framework.utils.Instrumentation import Instrumentation
+
+
+class TorchFlatEnsemble:
+    """
+    Trains K `TorchFlat` networks of the same architecture in one vectorized pass.
+
+    The parameters of the members are stacked along a new leading dimension and every batch runs through all
+    members at once with `torch.func.vmap`, so an epoch costs one Python loop instead of K. Members may differ
+    in their initial weights (e.g. seeds) and learning rate; the batch schedule (`epochs`, `batch_size`,
+    `shuffle`, `full_batch`, `batch_column`) is shared. Each member is optimized by its own Adam state,
+    equivalent to training it alone with `TorchModule.fit`, except that dropout masks are drawn independently
+    per member.
+    After `fit()` the trained weights are written back into the member modules.
+    """
+
+    # Default hyperparameters of torch.optim.Adam
+    betas = (0.9, 0.999)
+    eps = 1e-8
+
+    def __init__(self, members: List[TorchFlat]) -> None:
+        """
+        Wraps the members of the ensemble.
+
+        :param members: TorchFlat networks with identical architecture and training schedule
+        """
+        if not members:
+            raise ValueError("TorchFlatEnsemble needs at least one member")
+        self.members = members
+
+    def __len__(self):
+        return len(self.members)
+
+    def _check_members(self) -> None:
+        reference = self.members[0]
+        shapes = {name: value.shape for name, value in reference.state_dict().items()}
+        for member in self.members[1:]:
+            if {name: value.shape for name, value in member.state_dict().items()} != shapes:
+                raise ValueError("All ensemble members must have the same architecture")
+            for key in ('epochs', 'batch_size', 'shuffle', 'full_batch', 'batch_column'):
+                if getattr(member, key) != getattr(reference, key):
+                    raise ValueError(f"All ensemble members must share '{key}'")
+        for member in self.members:
+            if member.validation_split or member.patience is not None or member.lr_patience is not None:
+                raise ValueError("Early stopping and learning rate scheduling are not supported by TorchFlatEnsemble")
+
+    def _functional(self):
+        # Stateless copy of the architecture; the stacked parameters are passed in at every call
+        base = copy.deepcopy(self.members[0]).to('meta')
+
+        def compute(params, buffers, home, away):
+            return functional_call(base, (params, buffers), (None, home, away))
+
+        return base, compute
+
+    @Instrumentation.span("TorchFlatEnsemble.fit")
+    def fit(self, features: pd.DataFrame, labels: pd.DataFrame = None):
+        """
+        Trains all members on the same data.
+
+        Loss and accuracy of every member are appended to its `train_loss`, `train_accuracy` and `epochs_used`
+        as in `TorchModule.fit`.
+
+        :param features: DataFrame containing input features
+        :param labels: DataFrame containing ground truth labels
+        """
+        self._check_members()
+        reference = self.members[0]
+        groups = reference.batch_groups(features)
+        (_, home, away), targets = reference.prepare_tensors(features, labels)
+        num_models = len(self.members)
+        num_rows = len(targets)
+        num_batches = reference.batches_per_epoch(num_rows, groups)
+
+        params, buffers = stack_module_state(self.members)
+        base, compute = self._functional()
+        base.train()
+        forward = vmap(compute, in_dims=(0, 0, None, None), randomness='different')
+
+        lr = torch.tensor([member.lr for member in self.members], dtype=torch.float32)
+        first_moment = {name: torch.zeros_like(value) for name, value in params.items()}
+        second_moment = {name: torch.zeros_like(value) for name, value in params.items()}
+        step = 0
+
+        running_loss = torch.zeros(num_models)
+        running_correct = torch.zeros(num_models, dtype=torch.long)
+        for _ in range(reference.epochs):
+            for index in reference.batches(num_rows, groups):
+                if index is None:
+                    batch_home, batch_away, result = home, away, targets
+                else:
+                    batch_home, batch_away, result = home[index], away[index], targets[index]
+                outputs = forward(params, buffers, batch_home, batch_away)
+
+                # Mean loss per member; their sum gives every member the gradient of its own loss
+                losses = torch.nn.functional.nll_loss(
+                    outputs.reshape(-1, outputs.shape[-1]), result.repeat(num_models),
+                    reduction='none').view(num_models, -1).mean(1)
+                for value in params.values():
+                    value.grad = None
+                losses.sum().backward()
+
+                step += 1
+                with torch.no_grad():
+                    self._adam_step(params, first_moment, second_moment, lr, step)
+                running_loss += losses.detach()
+                running_correct += (outputs.detach().argmax(-1) == result).sum(1)
+
+        Instrumentation.count("batches", reference.epochs * math.ceil(num_batches))
+
+        # Write the trained weights back into the members
+        with torch.no_grad():
+            for k, member in enumerate(self.members):
+                for name, value in member.named_parameters():
+                    value.copy_(params[name][k])
+                member.epochs_used.append(reference.epochs)
+                member.train_loss.append(running_loss[k].item() / (num_batches * reference.epochs))
+                member.train_accuracy.append(running_correct[k].item() / (num_rows * reference.epochs))
+
+    def _adam_step(self, params: dict, first_moment: dict, second_moment: dict, lr: torch.Tensor, step: int):
+        beta1, beta2 = self.betas
+        bias_correction1 = 1 - beta1 ** step
+        bias_correction2 = 1 - beta2 ** step
+        for name, value in params.items():
+            grad = value.grad
+            if grad is None:
+                continue
+            first_moment[name].mul_(beta1).add_(grad, alpha=1 - beta1)
+            second_moment[name].mul_(beta2).addcmul_(grad, grad, value=1 - beta2)
+            denominator = (second_moment[name].sqrt() / bias_correction2 ** 0.5).add_(self.eps)
+            step_size = (lr / bias_correction1).view(-1, *([1] * (value.dim() - 1)))
+            value.sub_(step_size * first_moment[name] / denominator)
+
+    def predict_members(self, data: pd.DataFrame) -> np.ndarray:
+        """
+        Predicts output probabilities of every member.
+
+        :param data: DataFrame containing input features, must include columns 'HID' and 'AID'
+        :return: Numpy array of shape (members, rows, classes)
+        """
+        home = torch.from_numpy(data['HID'].to_numpy(dtype='int64'))
+        away = torch.from_numpy(data['AID'].to_numpy(dtype='int64'))
+        params, buffers = stack_module_state(self.members)
+        base, compute = self._functional()
+        base.eval()
+        with torch.no_grad():
+            outputs = vmap(compute, in_dims=(0, 0, None, None))(params, buffers, home, away)
+        return torch.exp(outputs).numpy()
+
+    def predict(self, data: pd.DataFrame, mode="test") -> np.ndarray:
+        """
+        Predicts output probabilities of the ensemble, the mean of the member probabilities.
+
+        :param data: DataFrame containing input features
+        :param mode: Optional flag for test/validation usage
+        :return: Numpy array of predicted probabilities
+        """
+        return self.predict_members(data).mean(axis=0)
@@ -1,10 +1,16 @@
+import copy
+
 import torch
 from torch.nn import Embedding, ModuleList, Linear, LogSoftmax, Dropout
 from torch_geometric.nn import GraphConv
 import torch.nn as nn
+import numpy as np
+import pandas as pd
 
 from sports_prediction_framework.datawrapper.sport.MatchWrapper import MatchWrapper
 from sports_prediction_framework.model.torch_model.TorchModule import TorchModule
+
+
 class TorchGNN(TorchModule):
     """
     A Graph Neural Network model that uses team embeddings and match-based graph structure
@@ -19,6 +25,7 @@ class TorchGNN(TorchModule):
         self.graph = graph
         self.num_teams = None
         self.embedding = None
+        self.node_cache = {}    # Graph key -> (graph, version, node representations), filled in eval mode
 
     def complex_init(self):
         """
@@ -55,14 +62,66 @@ class TorchGNN(TorchModule):
     def forward(self, features, home, away):
         """
         Performs a forward pass using the current match features and graph structure.
+
+        The graphs of all leagues in the batch are packed into one disjoint-union graph, so matches of
+        different leagues share a single pass of the graph convolutions.
+        """
+        groups = self.graph_groups(features)
+        keys = list(self.graph.graphs)
+        codes = torch.unique(groups).tolist()
+        x, offsets = self.node_representations([keys[code] for code in codes])
+
+        # Node of every match's teams in the union graph
+        home_nodes = torch.empty_like(home)
+        away_nodes = torch.empty_like(away)
+        for code, offset in zip(codes, offsets):
+            graph = self.graph.graphs[keys[code]]
+            mask = groups == code
+            home_nodes[mask] = torch.from_numpy(graph.nodes(home[mask]) + offset)
+            away_nodes[mask] = torch.from_numpy(graph.nodes(away[mask]) + offset)
+
+        x = torch.cat([x[home_nodes], x[away_nodes]], dim=1)
+
+        for layer in self.lin_layers:
+            x = self.activation(layer(x))
+            x = self.drop(x)
+
+        return self.out(x).reshape(-1, self.out_dim)
+
+    def node_representations(self, keys):
         """
-        key = features.iloc[0][self.graph.column].iloc[1]  # gets scalar value
+        Returns the node representations after all graph convolutions for the union of the given graphs.
 
+        In eval mode the representations of every graph are cached together with the graph's version, so
+        message passing runs once per graph state instead of once per batch or prediction call. The cache
+        is dropped whenever the weights can change (`fit()`, `load_state_dict()`).
+        """
+        if self.training:
+            return self.convolve(keys)
+
+        missing = [key for key in keys if not self._cached(key)]
+        if missing:
+            x, offsets = self.convolve(missing)
+            bounds = list(offsets[1:]) + [len(x)]
+            for key, start, stop in zip(missing, offsets, bounds):
+                graph = self.graph.graphs[key]
+                self.node_cache[key] = (graph, graph.version, x[start:stop].detach())
+
+        blocks = [self.node_cache[key][2] for key in keys]
+        offsets = np.concatenate([[0], np.cumsum([len(block) for block in blocks])[:-1]]).astype(np.int64)
+        return torch.cat(blocks), offsets
+
+    def _cached(self, key) -> bool:
+        entry = self.node_cache.get(key)
         graph = self.graph.graphs[key]
-        edge_index, edge_weight = graph.edge_index, graph.edge_weight
+        return entry is not None and entry[0] is graph and entry[1] == graph.version
 
-        x = torch.arange(self.num_teams, device=home.device)
-        x = self.embedding(x)
+    def convolve(self, keys):
+        """
+        Runs the embedding lookup and graph convolutions over the disjoint union of the given graphs.
+        """
+        teams, edge_index, edge_weight, offsets = self.graph.batch(keys)
+        x = self.embedding(teams)
 
         x = self.conv_layers[0](x, edge_index, edge_weight) if len(edge_weight) > 0 else self.conv_layers[0](x, edge_index)
         x = self.activation(x)
@@ -74,33 +133,94 @@ class TorchGNN(TorchModule):
             x = self.activation(x)
             x = self.drop(x)
 
-        x = torch.cat([x[home], x[away]], dim=1)
+        return x, offsets
 
-        for layer in self.lin_layers:
-            x = self.activation(layer(x))
-            x = self.drop(x)
+    def fit(self, features, labels=None):
+        """
+        Drops the cached node representations and trains the model.
+        """
+        self.node_cache = {}
+        super().fit(features, labels)
 
-        return self.out(x).reshape(-1, self.out_dim)
+    def load_state_dict(self, *args, **kwargs):
+        self.node_cache = {}
+        return super().load_state_dict(*args, **kwargs)
+
+    def graph_groups(self, features):
+        """
+        Returns the position of every match's graph in `graph.graphs` as a tensor.
 
-    def model_specific_computation(self, features, labels, batch_index):
+        Accepts either a features DataFrame or groups precomputed by `prepare_tensors()`.
+        """
+        if not isinstance(features, pd.DataFrame):
+            return features
+        column = features[self.graph.column]
+        if isinstance(column, pd.DataFrame):
+            # The graph column can appear more than once in the model's input columns
+            column = column.iloc[:, -1]
+        codes = pd.Categorical(column, categories=list(self.graph.graphs)).codes
+        if (codes < 0).any():
+            raise KeyError(f"No graph for {set(column[codes < 0])}")
+        return torch.from_numpy(codes.astype('int64'))
+
+    def prepare_tensors(self, features, labels):
         """
-        Updates the graph edges based on the current batch's match outcomes.
+        Converts team indices, graph groups and match results to tensors once.
         """
-        _, home, away = self.get_features_batch(features, batch_index)
-        result = self.get_labels_batch(labels, batch_index)
-        self.graph.graphs[features[self.graph.column].iloc[0][1]].compute(home, away, result)
+        home = torch.from_numpy(features['HID'].to_numpy(dtype='int64'))
+        away = torch.from_numpy(features['AID'].to_numpy(dtype='int64'))
+        result = torch.from_numpy(labels.to_numpy(dtype='int64').reshape(-1))
+        return (self.graph_groups(features), home, away), result
 
-    def get_features_batch(self, features, batch_index):
+    def model_specific_computation(self, batch, result):
         """
-        Extracts home and away team indices from features for the current batch.
+        Updates the edges of every graph in the batch with the outcomes of its matches.
         """
-        batch = features.iloc[batch_index:batch_index + self.batch_size]
-        home = torch.from_numpy(batch['HID'].values.astype('int64'))
-        away = torch.from_numpy(batch['AID'].values.astype('int64'))
-        return features, home, away
+        groups, home, away = batch
+        keys = list(self.graph.graphs)
+        for code in torch.unique(groups).tolist():
+            mask = groups == code
+            self.graph.graphs[keys[code]].compute(home[mask], away[mask], result[mask])
 
-    def get_labels_batch(self, labels, batch_index):
+    def inference_module(self) -> nn.Module:
         """
-        Extracts match result labels for the current batch.
+        Builds the serving module: (graph groups, home IDs, away IDs) -> probabilities.
+
+        The node representations of all graphs are computed once at their current state and stored in the
+        module, so serving runs no message passing. Groups are positions in `graph.graphs`, as returned by
+        `graph_groups()`. Export again after the graphs have been updated.
         """
-        return torch.from_numpy(labels.iloc[batch_index:batch_index + self.batch_size].values.astype('int64'))
\ No newline at end of file
+        was_training = self.training
+        self.eval()
+        with torch.no_grad():
+            keys = list(self.graph.graphs)
+            nodes, offsets = self.node_representations(keys)
+            node_of = torch.full((len(keys), self.num_teams), -1, dtype=torch.long)
+            for code, (key, offset) in enumerate(zip(keys, offsets)):
+                team_ids = torch.from_numpy(self.graph.graphs[key].team_ids)
+                node_of[code, team_ids] = offset + torch.arange(len(team_ids))
+        self.train(was_training)
+        return _GNNInference(nodes.clone(), node_of, self.lin_layers, self.activation)
+
+    def example_inputs(self):
+        team_ids = torch.from_numpy(next(iter(self.graph.graphs.values())).team_ids)
+        return torch.zeros(2, dtype=torch.long), team_ids[:1].repeat(2), team_ids[-1:].repeat(2)
+
+
+class _GNNInference(nn.Module):
+    """
+    Precomputed node representations plus a copy of the dense head of a TorchGNN, used for export.
+    """
+
+    def __init__(self, nodes: torch.Tensor, node_of: torch.Tensor, lin_layers: ModuleList, activation: nn.Module):
+        super().__init__()
+        self.register_buffer('nodes', nodes)
+        self.register_buffer('node_of', node_of)
+        self.lin_layers = copy.deepcopy(lin_layers)
+        self.activation = copy.deepcopy(activation)
+
+    def forward(self, groups: torch.Tensor, home: torch.Tensor, away: torch.Tensor) -> torch.Tensor:
+        x = torch.cat([self.nodes[self.node_of[groups, home]], self.nodes[self.node_of[groups, away]]], dim=1)
+        for layer in self.lin_layers:
+            x = self.activation(layer(x))
+        return torch.softmax(x, dim=1)
@@ -1,8 +1,12 @@
+import copy
+import math
+
 import torch
 import numpy as np
 import pandas as pd
 from typing import Tuple
 from abc import ABC, abstractmethod
+from sports_prediction_framework.utils.Instrumentation import Instrumentation
 
 
 class TorchModule(torch.nn.Module, ABC):
@@ -10,8 +14,7 @@ class TorchModule(torch.nn.Module, ABC):
     Base class for PyTorch models that handles training and prediction logic.
     Intended to be subclassed with specific implementations of:
     - forward()
-    - get_features_batch()
-    - get_labels_batch()
+    - prepare_tensors()
     - model_specific_computation()
     """
 
@@ -27,6 +30,16 @@ class TorchModule(torch.nn.Module, ABC):
         self.train_loss = []                # Store average training loss per epoch
         self.train_accuracy = []            # Store average training accuracy per epoch
         self.lr = 0.0001                    # Learning rate
+        self.shuffle = False                # Shuffle rows between epochs instead of keeping their order
+        self.full_batch = False             # Train on all rows in a single step per epoch, ignoring batch_size
+        self.batch_column = None            # Column(s) identifying a matchday; each batch is then one matchday
+        self.validation_split = 0.0         # Share of the most recent rows held out to monitor the loss
+        self.patience = None                # Epochs without improvement before training stops (None: never)
+        self.min_delta = 0.0                # Minimum decrease of the monitored loss counted as improvement
+        self.restore_best = True            # Reload the weights of the best epoch after early stopping
+        self.lr_patience = None             # Epochs without improvement before the learning rate is reduced
+        self.lr_factor = 0.5                # Factor the learning rate is multiplied with on a plateau
+        self.epochs_used = []               # Number of epochs actually run per fit() call
 
     @abstractmethod
     def forward(self, *args, **kwargs) -> torch.Tensor:
@@ -36,85 +49,245 @@ class TorchModule(torch.nn.Module, ABC):
         pass
 
     @abstractmethod
-    def get_features_batch(self, features: pd.DataFrame, start_index: int) -> Tuple:
+    def prepare_tensors(self, features: pd.DataFrame, labels: pd.DataFrame) -> Tuple[Tuple, torch.Tensor]:
         """
-        Extract a batch of features from the full dataset.
+        Converts the training data to tensors once per `fit()` call.
 
         :param features: Full features DataFrame
-        :param start_index: Start index of batch
-        :return: Batch tuple (to be passed to forward)
+        :param labels: Full labels DataFrame
+        :return: Tuple (inputs, targets). `inputs` are the arguments of `forward()`: tensors with one row per
+                 match are indexed per batch, any other value is passed to every batch unchanged.
+                 `targets` is a tensor of class indices.
         """
         pass
 
     @abstractmethod
-    def get_labels_batch(self, labels: pd.DataFrame, start_index: int) -> torch.Tensor:
+    def model_specific_computation(self, batch: Tuple, result: torch.Tensor) -> None:
         """
-        Extract corresponding labels for a feature batch.
+        Optional hook for any custom per-batch logic during training.
 
-        :param labels: Full labels DataFrame
-        :param start_index: Start index of batch
-        :return: Tensor of labels
+        It is also called once for the held-out rows after training (see `observe_validation()`).
+
+        :param batch: Inputs of the current batch, as passed to `forward()`
+        :param result: Labels of the current batch
         """
         pass
 
-    @abstractmethod
-    def model_specific_computation(self, features: pd.DataFrame, labels: pd.DataFrame, start_index: int) -> None:
+    def batches(self, num_rows: int, groups: np.ndarray = None):
         """
-        Optional hook for any custom per-batch logic during training.
+        Yields the row indices of every mini-batch of an epoch.
 
-        :param features: Features DataFrame
-        :param labels: Labels DataFrame
-        :param start_index: Start index of the current batch
+        Rows are visited in their original (chronological) order unless `shuffle` is set.
+        With groups (see `batch_groups()`), every batch holds the rows of one group, in the order the groups
+        first appear; `shuffle` then shuffles the order of the groups.
+        In full-batch mode there is a single batch covering all rows, represented by None.
+
+        :param num_rows: Number of training rows
+        :param groups: Optional group code of every row, only the first `num_rows` are used
+        :return: Sequence of index tensors
         """
-        pass
+        if self.full_batch:
+            return [None]
+        if groups is not None:
+            groups = groups[:num_rows]
+            order = torch.from_numpy(np.argsort(groups, kind='stable'))
+            batches = [batch for batch in torch.split(order, np.bincount(groups).tolist()) if len(batch)]
+            if self.shuffle:
+                batches = [batches[i] for i in torch.randperm(len(batches)).tolist()]
+            return batches
+        order = torch.randperm(num_rows) if self.shuffle else torch.arange(num_rows)
+        return torch.split(order, self.batch_size)
+
+    def batch_groups(self, features: pd.DataFrame):
+        """
+        Numbers the matchdays given by `batch_column` in the order they first appear.
+
+        :param features: DataFrame containing the batch column(s)
+        :return: Group code of every row, or None without a batch column
+        """
+        if self.batch_column is None:
+            return None
+        columns = [self.batch_column] if isinstance(self.batch_column, str) else list(self.batch_column)
+        frame = features.loc[:, ~features.columns.duplicated()]
+        return frame.groupby(columns, sort=False, dropna=False).ngroup().to_numpy()
+
+    def batches_per_epoch(self, num_rows: int, groups: np.ndarray = None) -> float:
+        """
+        Number of batches per epoch used to average the loss, `num_rows / batch_size` without groups.
+
+        :param num_rows: Number of training rows
+        :param groups: Optional group code of every row
+        :return: Number of batches
+        """
+        if self.full_batch:
+            return 1
+        if groups is not None:
+            return len(np.unique(groups[:num_rows]))
+        return num_rows / self.batch_size
+
+    def split_validation(self, inputs: Tuple, targets: torch.Tensor):
+        """
+        Holds out the most recent `validation_split` share of the rows for validation.
+
+        The rows are in chronological order, so the validation rows are the ones closest to the test window.
+
+        :param inputs: Inputs as returned by `prepare_tensors()`
+        :param targets: Targets as returned by `prepare_tensors()`
+        :return: Tuple ((inputs, targets), validation) where validation is None or the held-out (inputs, targets)
+        """
+        num_validation = int(len(targets) * self.validation_split)
+        if num_validation <= 0 or num_validation >= len(targets):
+            return (inputs, targets), None
+        cut = len(targets) - num_validation
+        train = tuple(x[:cut] if isinstance(x, torch.Tensor) else x for x in inputs)
+        validation = tuple(x[cut:] if isinstance(x, torch.Tensor) else x for x in inputs)
+        return (train, targets[:cut]), (validation, targets[cut:])
+
+    def observe_validation(self, validation: Tuple, groups: np.ndarray = None) -> None:
+        """
+        Passes the held-out rows through `model_specific_computation()` without training on them.
+
+        The batches are taken in chronological order, so models with per-batch state, such as the graphs of
+        `TorchGNN`, also include the matches closest to the test window.
+
+        :param validation: Held-out (inputs, targets)
+        :param groups: Optional group code of every held-out row
+        """
+        inputs, targets = validation
+        if self.full_batch:
+            batches = [None]
+        elif groups is not None:
+            order = torch.from_numpy(np.argsort(groups, kind='stable'))
+            batches = [batch for batch in torch.split(order, np.bincount(groups).tolist()) if len(batch)]
+        else:
+            batches = torch.split(torch.arange(len(targets)), self.batch_size)
+        with torch.no_grad():
+            for index in batches:
+                if index is None:
+                    self.model_specific_computation(inputs, targets)
+                else:
+                    batch = tuple(x[index] if isinstance(x, torch.Tensor) else x for x in inputs)
+                    self.model_specific_computation(batch, targets[index])
+
+    def validation_loss(self, validation: Tuple, criterion) -> float:
+        """
+        Computes the loss on the held-out rows without updating the model.
 
+        :param validation: Held-out (inputs, targets)
+        :param criterion: Loss function used for training
+        :return: Validation loss
+        """
+        inputs, targets = validation
+        self.eval()
+        with torch.no_grad():
+            loss = criterion(self(*inputs), targets).item()
+        self.train()
+        return loss
+
+    @Instrumentation.span("TorchModule.fit")
     def fit(self, features: pd.DataFrame, labels: pd.DataFrame = None):
         """
         Trains the model on the given features and labels.
 
+        The data is converted to tensors once and batches are taken from it with index tensors.
+        Gradients are reset before every optimizer step. Loss and accuracy are accumulated on the
+        device and read back once per epoch. With `full_batch`, every epoch is a single step on all rows,
+        with `batch_column`, every batch holds the matches of one matchday.
+
+        With `validation_split`, the most recent rows are held out and not trained on; after training they are
+        passed through `model_specific_computation()` once, so e.g. GNN graphs include them. The monitored loss
+        is the validation loss, or the mean training loss of the epoch without a validation split.
+        `patience` stops training after that many epochs without an improvement of at least `min_delta`
+        and restores the best weights; `lr_patience` multiplies the learning rate by `lr_factor` on a plateau.
+        The number of epochs actually run is stored in `epochs_used` and used to average the training metrics.
+
         :param features: DataFrame containing input features
         :param labels: DataFrame containing ground truth labels
         """
         criterion = torch.nn.NLLLoss()
         optimizer = torch.optim.Adam(self.parameters(), lr=self.lr)
+        groups = self.batch_groups(features)
+        inputs, targets = self.prepare_tensors(features, labels)
+        (inputs, targets), validation = self.split_validation(inputs, targets)
+        scheduler = None
+        if self.lr_patience is not None:
+            scheduler = torch.optim.lr_scheduler.ReduceLROnPlateau(optimizer, factor=self.lr_factor,
+                                                                   patience=self.lr_patience)
+        num_rows = len(targets)
+        num_batches = self.batches_per_epoch(num_rows, groups)
         running_loss = []
         running_accuracy = []
+        best_loss = math.inf
+        best_state = None
+        stale_epochs = 0
 
         for epoch in range(self.epochs):
-            acc = 0
-            loss_value = 0.0
-            optimizer.zero_grad()
+            loss_sum = torch.zeros(())
+            correct = torch.zeros((), dtype=torch.long)
 
             # Iterate over mini-batches
-            for j in range(0, features.shape[0], self.batch_size):
+            for index in self.batches(num_rows, groups):
                 # Get input features and labels for the batch
-                outputs = self(*self.get_features_batch(features, j))
-                result = self.get_labels_batch(labels, j)
+                if index is None:
+                    batch, result = inputs, targets
+                else:
+                    batch = tuple(x[index] if isinstance(x, torch.Tensor) else x for x in inputs)
+                    result = targets[index]
+                outputs = self(*batch)
 
                 # Compute loss and update weights
+                optimizer.zero_grad()
                 loss = criterion(outputs, result)
                 loss.backward()
                 optimizer.step()
-                loss_value += loss.item()
+                loss_sum += loss.detach()
 
                 # Compute number of correct predictions in batch
-                _, predicted = torch.max(outputs.data, 1)
-                correct = int((predicted == result).sum().item())
-                running_accuracy.append(correct)
-                acc += correct
+                correct += (outputs.detach().argmax(1) == result).sum()
 
                 # Optional subclass hook for additional computation/logging
-                self.model_specific_computation(features, labels, j)
+                self.model_specific_computation(batch, result)
+
+            loss_value = loss_sum.item()
+            acc = correct.item()
+            running_loss.append(loss_value)
+            running_accuracy.append(acc)
+
+            # Loss monitored for early stopping and learning rate scheduling
+            if validation is not None:
+                monitored = self.validation_loss(validation, criterion)
+            else:
+                monitored = loss_value / math.ceil(num_batches)
 
             # Print training info per epoch
             if self.print_info:
-                print(f"Epoch:{epoch}, train_loss:{loss_value:.5f}, train_acc:{acc / features.shape[0]:.5f}")
+                print(f"Epoch:{epoch}, train_loss:{loss_value:.5f}, train_acc:{acc / num_rows:.5f}, "
+                      f"monitored_loss:{monitored:.5f}")
 
-            running_loss.append(loss_value)
+            if scheduler is not None:
+                scheduler.step(monitored)
+            if self.patience is not None:
+                if monitored < best_loss - self.min_delta:
+                    best_loss = monitored
+                    best_state = copy.deepcopy(self.state_dict()) if self.restore_best else None
+                    stale_epochs = 0
+                else:
+                    stale_epochs += 1
+                    if stale_epochs >= self.patience:
+                        break
+
+        if best_state is not None:
+            self.load_state_dict(best_state)
+        if validation is not None:
+            self.observe_validation(validation, groups[num_rows:] if groups is not None else None)
+
+        epochs_used = len(running_loss)
+        self.epochs_used.append(epochs_used)
+        Instrumentation.count("batches", epochs_used * math.ceil(num_batches))
 
-        # Compute overall training metrics across all epochs
-        self.train_loss.append(sum(running_loss) / ((features.shape[0] / self.batch_size) * self.epochs))
-        self.train_accuracy.append(sum(running_accuracy) / (features.shape[0] * self.epochs))
+        # Compute overall training metrics across the epochs actually run
+        self.train_loss.append(sum(running_loss) / (num_batches * epochs_used))
+        self.train_accuracy.append(sum(running_accuracy) / (num_rows * epochs_used))
 
     def predict(self, data: pd.DataFrame, mode="test") -> np.ndarray:
         """
@@ -156,4 +329,35 @@ class TorchModule(torch.nn.Module, ABC):
         self.train()  # Switch back to training mode
         return outputs
 
+    @abstractmethod
+    def inference_module(self) -> torch.nn.Module:
+        """
+        Builds a standalone module for serving that maps ID tensors to probabilities, used by `export()`.
+        """
+        pass
 
+    @abstractmethod
+    def example_inputs(self) -> Tuple:
+        """
+        Returns example inputs of `inference_module()`, used for tracing.
+        """
+        pass
+
+    def export(self, path: str = None) -> torch.jit.ScriptModule:
+        """
+        Exports the current model as a traced and frozen TorchScript module for low-latency inference.
+
+        The module takes prebuilt ID tensors instead of a DataFrame, has no dropout or mode switching and
+        holds a copy of the current weights, so later training does not change it. It can be loaded with
+        `torch.jit.load()` without the framework installed.
+
+        :param path: Optional file the module is saved to
+        :return: Frozen TorchScript module
+        """
+        module = self.inference_module().eval()
+        with torch.no_grad():
+            traced = torch.jit.trace(module, self.example_inputs())
+        frozen = torch.jit.freeze(traced)
+        if path is not None:
+            torch.jit.save(frozen, path)
+        return frozen
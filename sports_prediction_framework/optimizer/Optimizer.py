@@ -6,6 +6,7 @@ from sports_prediction_framework.utils.Evaluation import evaluate_metrics
 from typing import Dict, Any, Tuple, Optional
 from typing import Any, Dict
 import pandas as pd
+from sports_prediction_framework.utils.Profiler import Profiler
 
 
 class Optimizer:
@@ -41,10 +42,14 @@ class Optimizer:
         self.sampler = sampler
         self.study = None
 
+    @Profiler.profile("Optimizer.run")
     def run(self):
         """
         Runs the optimization process using Optuna.
+
+        The learner's train/test splits are materialized once up front and shared by all trials.
         """
+        self.learner.materialize_splits(self.wrapper)
         self.study = optuna.create_study(direction=self.direction, sampler=self.sampler)
         self.study.optimize(self._objective, n_trials=self.n_trials)
 
@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 import pandas as pd
 
 from sports_prediction_framework.datawrapper.DataWrapper import DataWrapper
+from sports_prediction_framework.utils.Profiler import Profiler
 
 
 class Simulation(ABC):
@@ -19,6 +20,12 @@ class Simulation(ABC):
         results (list of float): List of profit/loss values for each match in the simulation.
     """
 
+    def __init_subclass__(cls, **kwargs):
+        # Every strategy's run() can be profiled through Profiler without decorating it by hand
+        super().__init_subclass__(**kwargs)
+        if 'run' in cls.__dict__:
+            cls.run = Profiler.profile(f"{cls.__name__}.run")(cls.run)
+
     def __init__(self, datawrapper: DataWrapper):
         """
         Initialize the Simulation base class.
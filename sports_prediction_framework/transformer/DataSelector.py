@@ -1,5 +1,9 @@
+import copy
 from sports_prediction_framework.transformer.Scope import Scope
 from sports_prediction_framework.transformer.ScopeSelector import *
+from sports_prediction_framework.transformer.ScopeSelector import positional_view, selected_rows
+from sports_prediction_framework.transformer.SplitPlan import Split, SplitPlan
+from sports_prediction_framework.utils.Instrumentation import Instrumentation
 
 
 class DataSelector:
@@ -16,6 +20,8 @@ class DataSelector:
         test_selectors (list[ScopeSelector]): List of testing data scope selectors.
         max_index (int): The maximum number of selectors among train/test.
         selector_index (int): The current index of the selector being updated.
+        step (int): Number of `update()` calls since the last reset.
+        plans (dict): Materialized split plans keyed by dataset fingerprint.
     """
 
     train_selectors = [Scope]
@@ -27,7 +33,8 @@ class DataSelector:
         self.test_selectors = test_selectors
         self.max_index = max(len(train_selectors), len(test_selectors))
         self.selector_index = self.max_index - 1
-
+        self.step = 0
+        self.plans = {}
 
     def holds(self):
         if self.selector_index < 0 or (self.train_selectors and not self.train_selectors[0].holds()) or \
@@ -49,6 +56,10 @@ class DataSelector:
 
         Iteration begins at the last scope and progresses through all valid configurations.
         """
+        self.step += 1
+        self._update()
+
+    def _update(self):
         if not self.holds():
             return
         if self.selector_index == self.max_index:
@@ -69,7 +80,7 @@ class DataSelector:
             if test_scope is not None:
                 test_scope.reset_state()
             self.selector_index -= 1
-            self.update()
+            self._update()
 
 
     def transform_wrapper(self, wrapper: DataWrapper, selectors: [ScopeSelector]):
@@ -81,13 +92,160 @@ class DataSelector:
             #wrapper_trans.current_selection[cur[0]] = cur[1]
         return wrapper_trans
 
+    @Instrumentation.span("DataSelector.transform_test")
     def transform_test(self, wrapper: DataWrapper):
+        split = self.planned_split(wrapper)
+        if split is not None:
+            return wrapper.deepcopy(wrapper.get_dataframe().take(split.test_rows))
         return self.transform_wrapper(wrapper, self.test_selectors)
 
+    @Instrumentation.span("DataSelector.transform_train")
     def transform_train(self, wrapper: DataWrapper):
+        split = self.planned_split(wrapper)
+        if split is not None:
+            return wrapper.deepcopy(wrapper.get_dataframe().take(split.train_rows))
         return self.transform_wrapper(wrapper, self.train_selectors)
 
     def reset_state(self):
         self.selector_index = self.max_index - 1
-        for selector in self.train_selectors:
+        self.step = 0
+        for selector in self.train_selectors + self.test_selectors:
             selector.reset_state()
+
+    def columns(self) -> tuple:
+        """
+        Returns the columns the selectors filter on.
+
+        Returns:
+            tuple: Distinct column names in selector order.
+        """
+        cols = [selector.scope.col for selector in self.train_selectors + self.test_selectors]
+        return tuple(dict.fromkeys(cols))
+
+    def materialize(self, wrapper: DataWrapper) -> SplitPlan:
+        """
+        Computes the full sequence of train/test splits for a dataset and keeps it for reuse.
+
+        The selectors are replayed from their initial state on private copies, so the current
+        iteration state is not affected. Afterwards `transform_train()`/`transform_test()` take the
+        rows of the current step directly from the plan for any wrapper with the same fingerprint.
+
+        Args:
+            wrapper (DataWrapper): Dataset to plan.
+
+        Returns:
+            SplitPlan: The materialized plan.
+        """
+        columns = self.columns()
+        fingerprint = SplitPlan.compute_fingerprint(wrapper, columns)
+        if fingerprint in self.plans:
+            return self.plans[fingerprint]
+
+        splits = []
+        frozen_tail = False
+        for split, holds in self._replay(wrapper, include_tail=True):
+            splits.append(split)
+            frozen_tail = not holds
+
+        plan = SplitPlan(fingerprint, columns, splits, frozen_tail)
+        self.plans[fingerprint] = plan
+        return plan
+
+    def iter_splits(self, wrapper: DataWrapper):
+        """
+        Lazily yields the train/test splits of every step, starting from the initial state.
+
+        Iteration runs on private copies of the selectors and never changes this selector's state,
+        so several consumers can walk the same DataSelector concurrently. Each split is computed only
+        when requested, which lets the next split be prepared while the previous one is trained on.
+
+        Args:
+            wrapper (DataWrapper): Dataset to split.
+
+        Yields:
+            Split: Immutable descriptor with the row positions and selector states of the split.
+        """
+        for split, _ in self._replay(wrapper):
+            yield split
+
+    def _replay(self, wrapper: DataWrapper, include_tail: bool = False):
+        positional = positional_view(wrapper)
+        replica = self._replica()
+        while True:
+            holds = replica.holds()
+            if not holds and not include_tail:
+                return
+            try:
+                split = replica._current_split(positional)
+            except Exception:
+                # The exhausted state may not be selectable (e.g. an enum index past the end)
+                if holds:
+                    raise
+                return
+            yield split, holds
+            if not holds:
+                return
+            replica.update()
+
+    def add_plan(self, plan: SplitPlan):
+        """
+        Registers a previously materialized (e.g. loaded) plan.
+
+        Args:
+            plan (SplitPlan): The plan to use for datasets with its fingerprint.
+        """
+        self.plans[plan.fingerprint] = plan
+
+    def planned_split(self, wrapper: DataWrapper):
+        """
+        Looks up the split of the current step in the plan matching the wrapper.
+
+        Args:
+            wrapper (DataWrapper): Dataset about to be split.
+
+        Returns:
+            Split or None: The planned split, or None if no plan covers the wrapper and step.
+        """
+        if not self.plans:
+            return None
+        plan = self.plans.get(SplitPlan.compute_fingerprint(wrapper, self.columns()))
+        if plan is None:
+            return None
+        return plan.split_at(self.step)
+
+    def test_positions(self, wrapper: DataWrapper):
+        """
+        Returns the row positions of the current testing subset in the wrapper, if a plan covers it.
+
+        Args:
+            wrapper (DataWrapper): Dataset about to be split.
+
+        Returns:
+            np.ndarray or None: Planned test rows, or None if the subset is selected by the selectors.
+        """
+        split = self.planned_split(wrapper)
+        return split.test_rows if split is not None else None
+
+    def _current_split(self, wrapper: DataWrapper) -> Split:
+        train = selected_rows(self.transform_wrapper(wrapper, self.train_selectors))
+        test = selected_rows(self.transform_wrapper(wrapper, self.test_selectors))
+        return Split(train, test,
+                     tuple(selector.current_state() for selector in self.train_selectors),
+                     tuple(selector.current_state() for selector in self.test_selectors))
+
+    def _replica(self):
+        memo = {}
+
+        def clone(obj):
+            if id(obj) not in memo:
+                memo[id(obj)] = copy.copy(obj)
+            return memo[id(obj)]
+
+        replica = copy.copy(self)
+        replica.plans = {}
+        replica.train_selectors = [clone(selector) for selector in self.train_selectors]
+        replica.test_selectors = [clone(selector) for selector in self.test_selectors]
+        for selector in replica.train_selectors + replica.test_selectors:
+            selector.scope = clone(selector.scope)
+        replica.reset_state()
+        return replica
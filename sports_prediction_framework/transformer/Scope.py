@@ -1,8 +1,8 @@
+import copy
 from abc import ABC, abstractmethod
 from datetime import timedelta
 from sports_prediction_framework.datawrapper.DataWrapper import DataWrapper
 from sports_prediction_framework.utils.AttributeSetter import AttributeSetter
-import pandas as pd
 
 
 class Scope(ABC):
@@ -67,6 +67,27 @@ class Scope(ABC):
         """
         pass
 
+    def states(self):
+        """
+        Lazily yield the state of every step, starting from the initial state.
+
+        Iteration runs on a private copy of the scope, so the scope's own state is left untouched
+        and several consumers (threads, generators) can walk the same scope at the same time.
+
+        Yields
+        ------
+        tuple
+            The value of `current_state()` for each step while the scope is inside its bounds.
+        """
+        cursor = copy.copy(self)
+        cursor.reset_state()
+        while cursor.inside():
+            yield cursor.current_state()
+            cursor.shift()
+
+    def __iter__(self):
+        return self.states()
+
 
 class WindowScope(Scope):
     """
@@ -196,22 +217,27 @@ class EnumScope(Scope):
     """
 
     default_parameters = {'col': 'League', 'enum': ['Bundesliga']}
-    cur_index = 0
 
     def __init__(self, wrapper=None, parameters=default_parameters):
         super().__init__(wrapper, parameters)
+        self.cur_index = 0
 
     def set_parameters_from_wrapper(self, wrapper: DataWrapper):
         """
         Initialize enum list from unique values of the column if not provided.
 
+        The values are read from the wrapper's cached group index, which `EnumSelector` reuses for selection.
+        Missing values (NaN/None) are not part of the list, unlike with `pd.unique`, since they cannot be
+        selected by value.
+
         Parameters
         ----------
         wrapper : DataWrapper
             Data wrapper to extract unique column values.
         """
         if 'enum' not in self.parameters:
-            self.enum = pd.unique(self.wrapper.get_columns(self.col)).tolist()
+            wrapper = wrapper if wrapper is not None else self.wrapper
+            self.enum = list(wrapper.data_handler.get_group_index(self.col).keys())
 
     def shift(self):
         """
@@ -237,14 +263,14 @@ class EnumScope(Scope):
 
     def current_state(self):
         """
-        Return the current enum value as a list for filtering.
+        Return the current enum value for filtering.
 
         Returns
         -------
         tuple
-            (column_name, [current_enum_value])
+            (column_name, (current_enum_value,))
         """
-        return (self.col, [self.enum[self.cur_index]])
+        return (self.col, (self.enum[self.cur_index],))
 
 
 class TestingWindowScope(WindowScope):
@@ -1,6 +1,10 @@
 from sports_prediction_framework.transformer.Scope import Scope, EnumScope
 from sports_prediction_framework.datawrapper.DataWrapper import DataWrapper
+from sports_prediction_framework.utils.Instrumentation import Instrumentation
 from abc import ABC, abstractmethod
+import copy
+import numpy as np
+import pandas as pd
 
 
 class ScopeSelector(ABC):
@@ -27,6 +31,68 @@ class ScopeSelector(ABC):
     def current_state(self):
         return self.scope.current_state()
 
+    def splits(self, dataset: DataWrapper):
+        """
+        Lazily yields the rows selected at every step of the scope, without changing its state.
+
+        Args:
+            dataset (DataWrapper): Dataset to select from.
+
+        Yields:
+            tuple: (state, rows) with the scope state and a read-only array of row positions in the dataset.
+        """
+        cursor = copy.copy(self)
+        cursor.scope = copy.copy(self.scope)
+        cursor.reset_state()
+        positional = positional_view(dataset)
+        while cursor.holds():
+            yield cursor.current_state(), selected_rows(cursor.transform(positional))
+            cursor.update()
+
+
+def positional_view(dataset: DataWrapper) -> DataWrapper:
+    """
+    Returns a wrapper over the same data whose index holds the row positions of the original frame.
+
+    Args:
+        dataset (DataWrapper): Dataset to index by position.
+
+    Returns:
+        DataWrapper: Wrapper sharing the column data of the dataset.
+    """
+    data = dataset.get_dataframe()
+    return dataset.deepcopy(data.set_axis(pd.RangeIndex(len(data)), copy=False))
+
+
+def selected_rows(selection: DataWrapper) -> np.ndarray:
+    """
+    Extracts the row positions of a selection made on a `positional_view`.
+
+    Args:
+        selection (DataWrapper): Selected subset.
+
+    Returns:
+        np.ndarray: Read-only array of row positions.
+    """
+    rows = selection.get_dataframe().index.to_numpy()
+    rows.flags.writeable = False
+    return rows
+
+
+def take_rows(dataset: DataWrapper, rows: np.ndarray) -> DataWrapper:
+    """
+    Copies the given rows of a dataset into a new wrapper that remembers where they were taken from.
+
+    Args:
+        dataset (DataWrapper): Dataset to select from.
+        rows (np.ndarray): Sorted row positions in the dataset.
+
+    Returns:
+        DataWrapper: Wrapper holding the selected rows.
+    """
+    selection = dataset.deepcopy(dataset.get_dataframe().take(rows))
+    selection.data_handler.set_source(dataset.data_handler, rows)
+    return selection
 
 
 class WindowSelector(ScopeSelector):
@@ -34,11 +100,26 @@ class WindowSelector(ScopeSelector):
     def __init__(self, scope: Scope) -> None:
         super(WindowSelector, self).__init__(scope)
 
+    @Instrumentation.span("WindowSelector.transform")
     def transform(self, dataset: DataWrapper) -> DataWrapper:
         data = dataset.get_dataframe()
-        trans = data[(data[self.scope.col] >= self.scope.start) &
-                     (data[self.scope.col] <= self.scope.start+self.scope.size)]
-        return dataset.deepcopy(trans)
+        # A subset taken by another selector (e.g. one league) is sorted once on the frame it came from
+        # and reused by every later subset with the same rows
+        source = dataset.data_handler.get_source()
+        try:
+            if source is None:
+                order, values = dataset.data_handler.get_sorted_index(self.scope.col)
+            else:
+                order, values = source[0].get_sorted_index(self.scope.col, source[1])
+        except TypeError:
+            # Column values are not mutually comparable, fall back to a full scan
+            trans = data[(data[self.scope.col] >= self.scope.start) &
+                         (data[self.scope.col] <= self.scope.start+self.scope.size)]
+            return dataset.deepcopy(trans)
+        low = values.searchsorted(self.scope.start, side='left')
+        high = values.searchsorted(self.scope.start + self.scope.size, side='right')
+        # Keep the original row order of the window
+        return take_rows(dataset, np.sort(order[low:high]))
 
     def __str__(self):
         return str(self.scope.start) + ' ' + str(self.scope.start+self.scope.size)
@@ -52,12 +133,11 @@ class EnumSelector(ScopeSelector):
         super().__init__(scope)
         self.scope = scope
 
+    @Instrumentation.span("EnumSelector.transform")
     def transform(self, dataset: DataWrapper) -> DataWrapper:
-        data = dataset.get_dataframe()
-        trans = data.loc[data[self.scope.col] == self.scope.enum[self.scope.cur_index]]
-        copy = dataset.deepcopy(trans)
-        #print(copy)
-        return copy
+        groups = dataset.data_handler.get_group_index(self.scope.col)
+        rows = groups.get(self.scope.enum[self.scope.cur_index], np.empty(0, dtype=np.intp))
+        return take_rows(dataset, rows)
 
     def __str__(self):
         return self.scope.enum[self.scope.cur_index]
@@ -0,0 +1,127 @@
+import hashlib
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from sports_prediction_framework.datawrapper.DataWrapper import DataWrapper
+from sports_prediction_framework.utils.Cache import Cache
+
+
+@dataclass(frozen=True)
+class Split:
+    """
+    A single train/test split of a dataset.
+
+    Attributes:
+        train_rows (np.ndarray): Row positions of the training subset in the planned dataset.
+        test_rows (np.ndarray): Row positions of the testing subset in the planned dataset.
+        train_state (tuple): `current_state()` of every training selector for this split.
+        test_state (tuple): `current_state()` of every testing selector for this split.
+    """
+    train_rows: np.ndarray
+    test_rows: np.ndarray
+    train_state: tuple
+    test_state: tuple
+
+
+class SplitPlan:
+    """
+    Ordered sequence of train/test splits computed once for a dataset.
+
+    A plan is bound to the dataset it was built from through a fingerprint of the index and the
+    columns the selectors filter on. Any wrapper with the same fingerprint can be split by position
+    without re-running the selectors. Plans are plain data and can be cached with `save()`/`load()`.
+
+    Attributes:
+        fingerprint (str): Fingerprint of the planned dataset.
+        columns (tuple): Columns covered by the fingerprint.
+        splits (list[Split]): Splits in iteration order.
+        frozen_tail (bool): Whether the last split is the state the selectors stay in once exhausted.
+    """
+
+    def __init__(self, fingerprint: str, columns: tuple, splits: list, frozen_tail: bool = False):
+        self.fingerprint = fingerprint
+        self.columns = columns
+        self.splits = splits
+        self.frozen_tail = frozen_tail
+
+    def __len__(self):
+        return len(self.splits)
+
+    def __iter__(self):
+        return iter(self.splits)
+
+    def __getitem__(self, item):
+        return self.splits[item]
+
+    def split_at(self, step: int):
+        """
+        Returns the split used after `step` updates of the selectors.
+
+        Args:
+            step (int): Number of updates since the last reset.
+
+        Returns:
+            Split or None: The split, or None if the plan does not cover the step.
+        """
+        if step < len(self.splits):
+            return self.splits[step]
+        if self.frozen_tail and self.splits:
+            return self.splits[-1]
+        return None
+
+    def matches(self, wrapper: DataWrapper) -> bool:
+        """
+        Checks whether the plan was built for a dataset equal to the wrapper's.
+
+        Args:
+            wrapper (DataWrapper): Dataset to check.
+
+        Returns:
+            bool: True if the fingerprints agree.
+        """
+        return self.compute_fingerprint(wrapper, self.columns) == self.fingerprint
+
+    def save(self, filepath: str) -> None:
+        """
+        Stores the plan with `Cache`.
+
+        Args:
+            filepath (str): Target file.
+        """
+        Cache.save(self, filepath)
+
+    @classmethod
+    def load(cls, filepath: str) -> "SplitPlan":
+        """
+        Loads a plan stored with `save()`.
+
+        Args:
+            filepath (str): Source file.
+
+        Returns:
+            SplitPlan: The stored plan.
+        """
+        return Cache.load(filepath)
+
+    @staticmethod
+    def compute_fingerprint(wrapper: DataWrapper, columns: tuple) -> str:
+        """
+        Hashes the index and the given columns of the wrapper's DataFrame.
+
+        The result is cached on the DataHandler until its frame changes.
+
+        Args:
+            wrapper (DataWrapper): Dataset to fingerprint.
+            columns (tuple): Columns the selectors filter on.
+
+        Returns:
+            str: Hex digest identifying the dataset.
+        """
+        def build():
+            data = wrapper.get_dataframe()
+            hashed = pd.util.hash_pandas_object(data[list(columns)], index=True).to_numpy()
+            return hashlib.sha1(hashed.tobytes()).hexdigest()
+
+        return wrapper.data_handler.get_cached(('fingerprint', columns), build)
@@ -0,0 +1,197 @@
+import functools
+import threading
+import time
+
+import pandas as pd
+
+
+class _Span:
+    """
+    Context manager and decorator timing one named stage. Created by `Instrumentation.span`.
+    """
+
+    __slots__ = ('name', 'start', 'children')
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        if Instrumentation.enabled:
+            self.children = 0.0
+            Instrumentation._stack().append(self)
+            self.start = time.perf_counter()
+        else:
+            self.start = None
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.start is None:
+            return
+        elapsed = time.perf_counter() - self.start
+        stack = Instrumentation._stack()
+        stack.pop()
+        if stack:
+            stack[-1].children += elapsed
+        Instrumentation._record(self.name, elapsed, elapsed - self.children)
+
+    def __call__(self, func):
+        name = self.name
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+
+class Instrumentation:
+    """
+    Process-wide registry of timing spans and counters for the learning pipeline.
+
+    Spans measure named stages (e.g. `Trainer.train`, `WindowSelector.transform`); nested spans are
+    tracked per thread, so every span reports both its total time and its self time excluding inner
+    spans. Counters accumulate quantities such as rows, batches and splits. Recording costs two clock
+    reads and a dictionary update per span and is enabled by default.
+
+    Like `MLFlowTracker`, the class only has class-level state and is used without instantiation:
+
+        with Instrumentation.span("my_stage"):
+            ...
+        Instrumentation.count("rows", len(df))
+        print(Instrumentation.report())
+    """
+    enabled = True
+    _spans = {}
+    _counters = {}
+    _lock = threading.Lock()
+    _local = threading.local()
+
+    @classmethod
+    def span(cls, name: str) -> _Span:
+        """
+        Create a span timing a block of code or, used as a decorator, every call of a function.
+
+        Parameters
+        ----------
+        name : str
+            Name of the stage the time is recorded under.
+
+        Returns
+        -------
+        _Span
+            A context manager that can also decorate functions.
+        """
+        return _Span(name)
+
+    @classmethod
+    def count(cls, name: str, value: int = 1) -> None:
+        """
+        Add a value to a named counter.
+
+        Parameters
+        ----------
+        name : str
+            Name of the counter, e.g. 'rows.train'.
+        value : int, optional
+            Amount to add (default is 1).
+        """
+        if not cls.enabled:
+            return
+        with cls._lock:
+            cls._counters[name] = cls._counters.get(name, 0) + value
+
+    @classmethod
+    def report(cls) -> pd.DataFrame:
+        """
+        Summarize the recorded spans.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per span, sorted by total time, with the number of calls, total and self
+            time in seconds, mean and max time per call in milliseconds and the share of the self
+            time in the total self time of all spans.
+        """
+        with cls._lock:
+            rows = {name: list(values) for name, values in cls._spans.items()}
+        report = pd.DataFrame.from_dict(rows, orient='index', columns=['calls', 'total_s', 'self_s', 'max_ms'])
+        report['mean_ms'] = report['total_s'] / report['calls'] * 1000
+        report['max_ms'] *= 1000
+        total_self = report['self_s'].sum()
+        report['self_share'] = report['self_s'] / total_self if total_self > 0 else 0.0
+        report.index.name = 'span'
+        return report[['calls', 'total_s', 'self_s', 'mean_ms', 'max_ms', 'self_share']].sort_values(
+            'total_s', ascending=False)
+
+    @classmethod
+    def counters(cls) -> dict:
+        """
+        Return a copy of the current counter values.
+
+        Returns
+        -------
+        dict
+            Mapping of counter name to its accumulated value.
+        """
+        with cls._lock:
+            return dict(cls._counters)
+
+    @classmethod
+    def reset(cls) -> None:
+        """
+        Discard all recorded spans and counters, e.g. at the start of a run.
+        """
+        with cls._lock:
+            cls._spans = {}
+            cls._counters = {}
+
+    @classmethod
+    def log_to_mlflow(cls, prefix: str = "profile", step: int = None) -> None:
+        """
+        Log the span totals and counters as metrics of the current MLflow run.
+
+        Parameters
+        ----------
+        prefix : str, optional
+            Prefix of the metric names (default is 'profile').
+        step : int, optional
+            Optional step index for the metrics (default is None).
+
+        Raises
+        ------
+        RuntimeError
+            If no MLflow run has been started via `MLFlowTracker`.
+        """
+        # Imported here so that instrumented modules do not load mlflow
+        from sports_prediction_framework.utils.MLFlowTracker import MLFlowTracker
+
+        report = cls.report()
+        metrics = {}
+        for name, row in report.iterrows():
+            metrics[f"{prefix}.{name}.total_s"] = float(row['total_s'])
+            metrics[f"{prefix}.{name}.self_s"] = float(row['self_s'])
+            metrics[f"{prefix}.{name}.calls"] = float(row['calls'])
+        for name, value in cls.counters().items():
+            metrics[f"{prefix}.{name}"] = float(value)
+        MLFlowTracker.log_metrics(metrics, step=step)
+
+    @classmethod
+    def _stack(cls) -> list:
+        stack = getattr(cls._local, 'stack', None)
+        if stack is None:
+            stack = cls._local.stack = []
+        return stack
+
+    @classmethod
+    def _record(cls, name: str, elapsed: float, own: float) -> None:
+        with cls._lock:
+            values = cls._spans.get(name)
+            if values is None:
+                cls._spans[name] = [1, elapsed, own, elapsed]
+            else:
+                values[0] += 1
+                values[1] += elapsed
+                values[2] += own
+                if elapsed > values[3]:
+                    values[3] = elapsed
@@ -72,8 +72,7 @@ class MLFlowTracker:
         """
         if cls._run is None:
             raise RuntimeError("Start a run before logging metrics.")
-        for k, v in metrics.items():
-            mlflow.log_metric(k, v, step=step)
+        mlflow.log_metrics(metrics, step=step)
 
     @classmethod
     def end_run(cls) -> None:
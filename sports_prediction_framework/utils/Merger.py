@@ -1,4 +1,5 @@
 from sports_prediction_framework.datawrapper.DataWrapper import DataWrapper
+from sports_prediction_framework.utils.Instrumentation import Instrumentation
 import pandas as pd
 from typing import List
 
@@ -11,29 +12,64 @@ class Merger:
     into a consolidated dataset, assuming all input wrappers are compatible in terms of
     schema and semantics.
 
+    Three strategies are available:
+    - 'columns': inner merges on every column the DataFrames have in common (the original behaviour).
+    - 'index': rows are aligned by index and only the columns a wrapper adds are concatenated.
+    - 'key': like 'index', but rows are aligned by a unique key column such as `MatchID`.
+
+    Attributes:
+        strategy (str): Merge strategy.
+        key (str): Key column used by the 'key' strategy.
     """
 
-    def compute(self, wrappers: List[DataWrapper]) -> DataWrapper:
+    strategies = ('columns', 'index', 'key')
+
+    def __init__(self, strategy: str = 'columns', key: str = 'MatchID'):
+        if strategy not in self.strategies:
+            raise ValueError(f"Unknown merge strategy '{strategy}', expected one of {self.strategies}")
+        self.strategy = strategy
+        self.key = key
+
+    @Instrumentation.span("Merger.compute")
+    def compute(self, wrappers: List[DataWrapper], parent: DataWrapper = None) -> DataWrapper:
         """
         Merges a list of compatible DataWrapper instances into one.
 
         This method performs the following steps:
         - Collects all unique feature and label columns from the wrappers.
-        - Merges the underlying DataFrames using common columns as join keys.
+        - Merges the underlying DataFrames according to the strategy.
         - Creates a deep copy of the first wrapper and replaces its data with the merged DataFrame.
         - Combines team ID sets from all wrappers.
 
         Args:
             wrappers (List[DataWrapper]): A list of DataWrapper objects to be merged.
                                            All wrappers must have compatible schemas.
+            parent (DataWrapper, optional): Wrapper all inputs were derived from (e.g. the dataset passed to
+                                            nested learners). With the 'index' and 'key' strategies its columns
+                                            are shared by the result and every other column is new.
 
         Returns:
             DataWrapper: A new DataWrapper containing the merged data.
         """
-        features = list(set.union(*(w.data_handler.feature_cols for w in wrappers)))
-        labels = list(set.union(*(w.data_handler.label_cols for w in wrappers)))
-        merged_df = self.merge([w.get_dataframe() for w in wrappers])
-        merged_wrapper = wrappers[0].deepcopy(merged_df, features, labels)
+        features = set.union(*(w.data_handler.feature_cols for w in wrappers))
+        labels = set.union(*(w.data_handler.label_cols for w in wrappers))
+
+        if self.strategy == 'columns':
+            merged_df = self.merge([w.get_dataframe() for w in wrappers])
+            predictions = None
+        else:
+            base = parent.get_dataframe() if parent is not None else None
+            merged_df, renamed = self.concat([w.get_dataframe() for w in wrappers], base)
+            features = {renamed.get((i, c), c) for i, w in enumerate(wrappers) for c in w.data_handler.feature_cols}
+            predictions = []
+            for i, w in enumerate(wrappers):
+                for col in w.data_handler.prediction_cols or []:
+                    name = renamed.get((i, col), col)
+                    if name in merged_df.columns and name not in predictions:
+                        predictions.append(name)
+
+        merged_wrapper = wrappers[0].deepcopy(merged_df, list(features), list(labels))
+        merged_wrapper.data_handler.prediction_cols = predictions
         merged_wrapper.total_set_of_teams_ids = set.union(*(w.total_set_of_teams_ids for w in wrappers))
         return merged_wrapper
 
@@ -59,3 +95,50 @@ class Merger:
             pre = pre.merge(d, on=list(common_cols))
         return pre
 
+    def concat(self, dfs: List[pd.DataFrame], base: pd.DataFrame = None):
+        """
+        Aligns DataFrames row by row and concatenates the columns each of them adds to the base.
+
+        The base columns are shared with the result, not copied. Without a base, the columns present in
+        every DataFrame form the base. A new column whose name is already taken gets the suffix `_<i>`,
+        where `i` is the position of its DataFrame in `dfs`. Rows missing from a DataFrame hold NaN.
+
+        Args:
+            dfs (List[pd.DataFrame]): DataFrames to combine.
+            base (pd.DataFrame, optional): DataFrame all inputs were derived from.
+
+        Returns:
+            tuple[pd.DataFrame, dict]: The combined DataFrame and a mapping of (position, column) to the new
+                name of every renamed column.
+        """
+        if base is None:
+            shared = dfs[0].columns
+            for d in dfs[1:]:
+                shared = shared.intersection(d.columns, sort=False)
+            base = dfs[0][shared]
+
+        parts = [base]
+        taken = set(base.columns)
+        renamed = {}
+        for i, d in enumerate(dfs):
+            new_cols = d.columns.difference(base.columns, sort=False)
+            if len(new_cols) == 0:
+                continue
+            part = self._align(d, base)[new_cols]
+            names = {}
+            for col in new_cols:
+                if col in taken:
+                    names[col] = renamed[(i, col)] = f"{col}_{i}"
+                taken.add(names.get(col, col))
+            parts.append(part.rename(columns=names) if names else part)
+
+        return pd.concat(parts, axis=1, copy=False), renamed
+
+    def _align(self, df: pd.DataFrame, base: pd.DataFrame) -> pd.DataFrame:
+        if self.strategy == 'key':
+            aligned = df.set_index(self.key).reindex(base[self.key].to_numpy())
+            aligned.index = base.index
+            return aligned
+        if df.index is base.index or df.index.equals(base.index):
+            return df
+        return df.reindex(base.index)
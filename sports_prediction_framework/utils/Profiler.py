@@ -0,0 +1,172 @@
+import cProfile
+import functools
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+
+class Profiler:
+    """
+    Opt-in profiler for whole pipeline runs such as `Learner.compute`, `Optimizer.run` or `Simulation.run`.
+
+    Profiling is off unless a mode is set, either with the environment variable `SPF_PROFILE`
+    ('cprofile' or 'sampling') or with `Profiler.enable()`. Only the outermost profiled call of a
+    thread is profiled, so nested runs (e.g. inner learners) are part of their parent's profile.
+
+    Every profiled call writes its files to `directory`, named after the run and a timestamp:
+
+    - 'cprofile' mode: an exact `.pstats` file readable with `pstats`/snakeviz. cProfile only records
+      caller/callee pairs, not full stacks, so use the sampling mode for flame graphs.
+    - 'sampling' mode: the stack of the profiled thread is sampled every `interval` seconds. Writes a
+      `.txt` summary of the hottest functions and a `.collapsed` file with the exact sampled stacks.
+
+    Collapsed files contain one `frame;frame;frame value` line per stack and can be fed directly to
+    flamegraph.pl or speedscope.
+    """
+    modes = ('cprofile', 'sampling')
+    mode = os.environ.get("SPF_PROFILE") or None
+    directory = os.environ.get("SPF_PROFILE_DIR", "profiles")
+    interval = float(os.environ.get("SPF_PROFILE_INTERVAL", 0.005))
+    _local = threading.local()
+
+    @classmethod
+    def enable(cls, mode: str = 'cprofile', directory: str = None, interval: float = None) -> None:
+        """
+        Turn profiling on.
+
+        Parameters
+        ----------
+        mode : str, optional
+            'cprofile' for deterministic profiling or 'sampling' (default is 'cprofile').
+        directory : str, optional
+            Directory the profiles are written to.
+        interval : float, optional
+            Sampling interval in seconds for the 'sampling' mode.
+
+        Raises
+        ------
+        ValueError
+            If the mode is unknown.
+        """
+        if mode not in cls.modes:
+            raise ValueError(f"Unknown profiling mode '{mode}', expected one of {cls.modes}")
+        cls.mode = mode
+        if directory is not None:
+            cls.directory = directory
+        if interval is not None:
+            cls.interval = interval
+
+    @classmethod
+    def disable(cls) -> None:
+        """
+        Turn profiling off.
+        """
+        cls.mode = None
+
+    @classmethod
+    def profile(cls, name: str):
+        """
+        Decorator profiling every outermost call of a function while profiling is enabled.
+
+        Parameters
+        ----------
+        name : str
+            Name of the run, used in the file names.
+
+        Returns
+        -------
+        Callable
+            The decorator.
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if cls.mode is None or getattr(cls._local, 'active', False):
+                    return func(*args, **kwargs)
+                cls._local.active = True
+                try:
+                    return cls._run(name, func, args, kwargs)
+                finally:
+                    cls._local.active = False
+
+            return wrapper
+
+        return decorator
+
+    @classmethod
+    def _run(cls, name, func, args, kwargs):
+        os.makedirs(cls.directory, exist_ok=True)
+        stem = os.path.join(cls.directory, f"{name}_{time.strftime('%Y%m%d-%H%M%S')}_{os.getpid()}")
+
+        if cls.mode == 'sampling':
+            sampler = _Sampler(threading.get_ident(), cls.interval)
+            sampler.start()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                sampler.stop()
+                sampler.dump(stem)
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            profiler.dump_stats(stem + ".pstats")
+
+
+def _frame_name(filename: str, line: int, function: str) -> str:
+    return f"{function} ({os.path.basename(filename)}:{line})"
+
+
+def _write_collapsed(path: str, stacks: Counter):
+    with open(path, 'w') as f:
+        for stack, value in sorted(stacks.items()):
+            if value > 0:
+                f.write(f"{';'.join(stack)} {value}\n")
+
+
+class _Sampler(threading.Thread):
+    """
+    Background thread recording the stack of another thread at a fixed interval.
+    """
+
+    def __init__(self, target: int, interval: float):
+        super().__init__(daemon=True)
+        self.target = target
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(_frame_name(code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+    def dump(self, stem: str):
+        _write_collapsed(stem + ".collapsed", self.stacks)
+        own = Counter()
+        cumulative = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for frame in set(stack):
+                cumulative[frame] += count
+        total = sum(self.stacks.values()) or 1
+        with open(stem + ".txt", 'w') as f:
+            f.write(f"{total} samples every {self.interval * 1000:g} ms\n\n")
+            f.write(f"{'own %':>8} {'cum %':>8}  function\n")
+            for frame, count in cumulative.most_common():
+                f.write(f"{own[frame] / total * 100:8.2f} {count / total * 100:8.2f}  {frame}\n")
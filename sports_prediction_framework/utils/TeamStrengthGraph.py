@@ -1,6 +1,8 @@
+import copy
+
 import torch
 import numpy as np
-from sports_prediction_framework.transformer.ScopeSelector import ScopeSelector
+from sports_prediction_framework.transformer.ScopeSelector import ScopeSelector, EnumSelector
 from sports_prediction_framework.datawrapper.sport.MatchWrapper import MatchWrapper
 from sports_prediction_framework.datawrapper.DataWrapper import DataWrapper
 from torch_geometric.data import Data
@@ -31,9 +33,16 @@ class TeamStrengthGraph:
         """
         Computes graphs for each state in the scope and stores them internally.
 
+        For an `EnumSelector` scope all graphs are built from one grouped pass over the wrapper's frame,
+        using its cached group index, without materializing a wrapper per group. Other scopes are walked
+        step by step.
+
         Args:
             wrapper: A data wrapper object used for transformation.
         """
+        if isinstance(self.scope, EnumSelector) and isinstance(wrapper, MatchWrapper):
+            self.compute_groups(wrapper)
+            return
 
         while self.scope.holds():
             trans = self.scope.transform(wrapper)
@@ -41,68 +50,255 @@ class TeamStrengthGraph:
                 num_teams = len(trans.get_set_of_teams())
                 num_matches = len(trans.get_dataframe().index)
                 key = self.scope.current_state()[1][0]
-                self.graphs[key] = self.Graph(num_teams, num_matches)
+                self.graphs[key] = self.Graph(num_teams, num_matches, sorted(trans.get_set_of_teams_ids()))
                 #print(key)
                 self.scope.update()
 
+    def compute_groups(self, wrapper: MatchWrapper):
+        """
+        Builds the graph of every value of the enum scope from a single pass over the data.
+
+        Args:
+            wrapper (MatchWrapper): Matches of all groups.
+        """
+        scope = self.scope.scope
+        if not hasattr(scope, 'enum'):
+            scope.set_parameters_from_wrapper(wrapper)
+        data = wrapper.get_dataframe()
+        groups = wrapper.data_handler.get_group_index(scope.col)
+        home = data['HID'].to_numpy()
+        away = data['AID'].to_numpy()
+        empty = np.empty(0, dtype=np.intp)
+
+        for key in scope.enum:
+            rows = groups.get(key, empty)
+            teams = np.unique(np.concatenate([home[rows], away[rows]]))
+            self.graphs[key] = self.Graph(len(teams), len(rows), teams)
+
+    def times(self) -> dict:
+        """
+        Returns the current time of every graph, e.g. to snapshot the graphs at this point later.
+
+        Returns:
+            dict: Mapping of graph key to its `curr_time`.
+        """
+        return {key: graph.curr_time for key, graph in self.graphs.items()}
+
+    def snapshot(self, times: dict = None) -> 'TeamStrengthGraph':
+        """
+        Returns an independent copy of the graphs as they were at the given times.
 
+        Snapshots share nothing mutable with this object, so several of them can be evaluated or trained
+        concurrently, e.g. one per test window.
 
+        Args:
+            times (dict, optional): Time per graph key, as returned by `times()`. Graphs without an entry
+                are copied at their current time. Defaults to the current times.
+
+        Returns:
+            TeamStrengthGraph: Snapshot with the same scope and column.
+        """
+        times = times or {}
+        snapshot = copy.copy(self)
+        snapshot.graphs = {key: graph.snapshot(times.get(key, graph.curr_time)) for key, graph in self.graphs.items()}
+        return snapshot
+
+    def batch(self, keys: list):
+        """
+        Packs several graphs into one disjoint-union graph, in the style of a torch_geometric `Batch`.
+
+        The nodes of every graph are placed after the nodes of the previous ones and its edges are shifted
+        by the same offset, so one message passing step over the union updates all graphs independently.
+
+        Args:
+            keys (list): Keys of the graphs to pack.
+
+        Returns:
+            tuple: (teams, edge_index, edge_weight, offsets) with the team ID of every node, the shifted
+                edges and their weights, and the offset of the first node of every graph.
+        """
+        graphs = [self.graphs[key] for key in keys]
+        sizes = [graph.num_teams for graph in graphs]
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+        teams = torch.from_numpy(np.concatenate([graph.team_ids for graph in graphs]))
+        edge_index = torch.cat([graph.edge_index + int(offset) for graph, offset in zip(graphs, offsets)], dim=1)
+        edge_weight = torch.cat([graph.edge_weight for graph in graphs])
+        return teams, edge_index, edge_weight, offsets
 
     class Graph:
         """
         A class representing a directed temporal graph of team interactions.
 
+        Edges are stored sparsely: a dictionary maps every (loser, winner) pair to its position in growable
+        COO arrays holding the edges and the time of their last match. An update only touches the edges of
+        its matches and appends new edges at the end, so `edge_index` grows incrementally. Edge weights are
+        computed from the edge times when they are first accessed after an update.
+
+        Every update also appends the positions of the edges it touched to a compact delta log, so the graph
+        as it was after any earlier update can be materialized with `snapshot()`.
+
         Attributes:
             num_matches (int): Total number of matches in the dataset.
-            edge_index (torch.Tensor): Tensor of shape [2, num_edges] containing directed edges.
+            edge_index (torch.Tensor): Tensor of shape [2, num_edges] containing directed edges, in the order they were added.
             edge_weight (torch.Tensor): Tensor of edge weights based on recency.
-            edge_time (torch.Tensor): Matrix of last match times between teams.
+            edge_position (dict): Position of every edge, keyed by `loser * num_teams + winner`.
+            edge_time (np.ndarray): Time of the last match of every edge.
+            num_edges (int): Number of edges.
             curr_time (int): Current time step (match index).
             num_teams (int): Total number of unique teams.
+            team_ids (np.ndarray): Sorted team IDs of the nodes; node i represents team_ids[i].
+            version (int): Number of updates applied, identifies the current state of the graph.
+            delta_positions (np.ndarray): Positions of the edges touched by every update, in update order.
+            delta_offsets (list): End of every update's positions in `delta_positions`.
+            delta_edges (list): Number of edges after every update.
         """
 
-        def __init__(self, num_teams: int, num_matches: int):
+        def __init__(self, num_teams: int, num_matches: int, team_ids=None):
             """
             Initializes a new Graph.
 
             Args:
                 num_teams (int): Number of unique teams.
                 num_matches (int): Total number of matches (for normalization).
+                team_ids (iterable, optional): IDs of the teams in the graph. Defaults to 0..num_teams-1.
             """
+            if team_ids is None:
+                team_ids = np.arange(num_teams)
+            self.team_ids = np.sort(np.asarray(list(team_ids), dtype=np.int64))
+            if len(self.team_ids) != num_teams:
+                raise ValueError(f"Expected {num_teams} team IDs, got {len(self.team_ids)}")
             self.num_matches = num_matches
             self.edge_index = torch.empty((2, 0), dtype=torch.long)
-            self.edge_weight = torch.empty((0,), dtype=torch.float)
-            self.edge_time = torch.full((num_teams, num_teams), float('nan'))
+            self.edge_position = {}
+            self.edges = np.empty((2, 16), dtype=np.int64)
+            self.edge_time = np.empty(16, dtype=np.float32)
+            self.num_edges = 0
+            self.time_weighing = "linear"
+            self.weight_time = 0
+            self._edge_weight = torch.empty((0,), dtype=torch.float)
             self.curr_time = 0
             self.num_teams = num_teams
+            self.version = 0
+            self.delta_positions = np.empty(16, dtype=np.int64)
+            self.delta_offsets = []
+            self.delta_edges = []
 
         def compute(self, home: np.ndarray, away: np.ndarray, result: np.ndarray, time_weighing: str = "linear") -> Data:
             """
             Updates the graph with new match results and returns a PyTorch Geometric Data object.
 
             Args:
-                home (np.ndarray): Array of encoded home team indices.
-                away (np.ndarray): Array of encoded away team indices.
+                home (np.ndarray): Array of home team IDs.
+                away (np.ndarray): Array of away team IDs.
                 result (np.ndarray): Array of match results (0=draw, 1=home win, 2=away win).
                 time_weighing (str): Time decay strategy, either "linear" or "exponential".
 
             Returns:
                 Data: PyTorch Geometric graph object with edge_index and edge_weight.
             """
-            self.update_edge_time(home, away, result)
+            positions = self.update_edge_time(self.nodes(home), self.nodes(away), np.asarray(result))
+            self.record_delta(positions)
             self.update_edge_index()
             self.calculate_edge_weight(time_weighing)
             self.curr_time += 1
+            self.version += 1
             return self.build_graph()
 
+        def record_delta(self, positions: np.ndarray):
+            """
+            Appends the edges touched by the current update to the delta log.
+
+            Args:
+                positions (np.ndarray): Positions of the touched edges.
+            """
+            start = self.delta_offsets[-1] if self.delta_offsets else 0
+            end = start + len(positions)
+            if end > len(self.delta_positions):
+                grown = np.empty(max(end, 2 * len(self.delta_positions)), dtype=np.int64)
+                grown[:start] = self.delta_positions[:start]
+                self.delta_positions = grown
+            self.delta_positions[start:end] = positions
+            self.delta_offsets.append(end)
+            self.delta_edges.append(self.num_edges)
+
+        def snapshot(self, curr_time: int) -> 'TeamStrengthGraph.Graph':
+            """
+            Materializes the graph as it was after its first `curr_time` updates.
+
+            The snapshot is an independent graph: it can be used for prediction or updated further without
+            affecting this graph. Its cost depends on the number of logged edge changes, not on the number of teams.
+
+            Args:
+                curr_time (int): Number of updates to keep, between 0 and the current time.
+
+            Returns:
+                TeamStrengthGraph.Graph: The graph at the given time.
+
+            Raises:
+                ValueError: If the time is outside the recorded history.
+            """
+            if not 0 <= curr_time <= self.curr_time:
+                raise ValueError(f"Time {curr_time} is outside the recorded history [0, {self.curr_time}]")
+            graph = TeamStrengthGraph.Graph(self.num_teams, self.num_matches, self.team_ids)
+            graph.time_weighing = self.time_weighing
+            if curr_time == 0:
+                return graph
+
+            num_edges = self.delta_edges[curr_time - 1]
+            num_deltas = self.delta_offsets[curr_time - 1]
+            steps = np.repeat(np.arange(curr_time), np.diff(self.delta_offsets[:curr_time], prepend=0))
+            edge_time = np.zeros(num_edges, dtype=np.float32)
+            np.maximum.at(edge_time, self.delta_positions[:num_deltas], steps.astype(np.float32))
+
+            graph.edges = self.edges[:, :num_edges].copy()
+            graph.edge_time = edge_time
+            graph.num_edges = num_edges
+            keys = graph.edges[0] * self.num_teams + graph.edges[1]
+            graph.edge_position = dict(zip(keys.tolist(), range(num_edges)))
+            graph.delta_positions = self.delta_positions[:num_deltas].copy()
+            graph.delta_offsets = self.delta_offsets[:curr_time]
+            graph.delta_edges = self.delta_edges[:curr_time]
+            graph.curr_time = curr_time
+            graph.version = curr_time
+            graph.update_edge_index()
+            graph.weight_time = curr_time - 1
+            graph._edge_weight = None
+            return graph
+
+        def nodes(self, teams) -> np.ndarray:
+            """
+            Translates team IDs into node indices of this graph.
+
+            Args:
+                teams (array-like): Team IDs, all of them part of the graph.
+
+            Returns:
+                np.ndarray: Node index of every team.
+
+            Raises:
+                KeyError: If a team is not part of the graph.
+            """
+            teams = np.asarray(teams)
+            positions = np.searchsorted(self.team_ids, teams)
+            if len(self.team_ids) == 0:
+                missing = np.ones(teams.shape, dtype=bool)
+            else:
+                missing = self.team_ids[np.minimum(positions, len(self.team_ids) - 1)] != teams
+            if missing.any():
+                raise KeyError(f"Teams {sorted(set(teams[missing].tolist()))} are not in the graph")
+            return positions
+
         def update_edge_time(self, home: np.ndarray, away: np.ndarray, result: np.ndarray):
             """
-            Updates the edge_time matrix to record when matches occurred between teams.
+            Records the current time on the edges of the given matches, adding the edges not seen before.
 
             Args:
-                home (np.ndarray): Encoded indices of home teams.
-                away (np.ndarray): Encoded indices of away teams.
+                home (np.ndarray): Node indices of home teams.
+                away (np.ndarray): Node indices of away teams.
                 result (np.ndarray): Match results (0=draw, 1=home win, 2=away win).
+
+            Returns:
+                np.ndarray: Positions of the touched edges.
             """
 
             winning_team = np.array([], dtype=np.int64)
@@ -122,40 +318,65 @@ class TeamStrengthGraph:
             winning_team = np.append(winning_team, away[idx])
             losing_team = np.append(losing_team, home[idx])
 
-            self.edge_time[losing_team, winning_team] = self.curr_time
+            keys = np.unique(losing_team * self.num_teams + winning_team)
+            positions = np.empty(len(keys), dtype=np.int64)
+            for i, key in enumerate(keys.tolist()):
+                position = self.edge_position.get(key)
+                if position is None:
+                    position = self._add_edge(key // self.num_teams, key % self.num_teams)
+                positions[i] = position
+            self.edge_time[positions] = self.curr_time
+            return positions
+
+        def _add_edge(self, src: int, dst: int) -> int:
+            position = self.num_edges
+            if position == self.edges.shape[1]:
+                # Grow the buffers geometrically, so appending stays amortized O(1)
+                self.edges = np.concatenate([self.edges, np.empty_like(self.edges)], axis=1)
+                self.edge_time = np.concatenate([self.edge_time, np.empty_like(self.edge_time)])
+            self.edges[0, position] = src
+            self.edges[1, position] = dst
+            self.edge_position[src * self.num_teams + dst] = position
+            self.num_edges += 1
+            return position
 
         def update_edge_index(self):
             """
             Updates the edge_index tensor with current directed edges.
+
+            The tensor is a view of the edge buffer, so no edges are copied.
             """
-            src, dst = np.where(~np.isnan(self.edge_time))
-            self.edge_index = torch.tensor([src, dst], dtype=torch.long)
+            if self.edge_index.shape[1] != self.num_edges:
+                self.edge_index = torch.from_numpy(self.edges[:, :self.num_edges])
 
         def calculate_edge_weight(self, time_weighing: str = "linear"):
             """
-            Computes edge weights based on time decay since the last match.
+            Marks the edge weights for recomputation at the current time.
+
+            The weights are only computed when `edge_weight` is accessed.
 
             Args:
                 time_weighing (str): "linear" or "exponential" decay of influence.
             """
-            if self.edge_index.numel() > 0:
-                from_nodes = self.edge_index[0].numpy()
-                to_nodes = self.edge_index[1].numpy()
-
-                # Work in NumPy
-                prev_edge_time = np.array(self.edge_time[from_nodes, to_nodes], copy=True)
-                prev_edge_time[np.isnan(prev_edge_time)] = self.curr_time
-
-                if time_weighing == "linear":
-                    weights = 1 - ((self.curr_time - prev_edge_time) / self.num_matches)
-                elif time_weighing == "exponential":
-                    weights = np.exp(- (self.curr_time - prev_edge_time))
+            if time_weighing not in ("linear", "exponential"):
+                raise ValueError(f"Unknown time weighing strategy: {time_weighing}")
+            self.time_weighing = time_weighing
+            self.weight_time = self.curr_time
+            self._edge_weight = None
+
+        @property
+        def edge_weight(self) -> torch.Tensor:
+            """
+            Edge weights based on the time decay since the last match of every edge.
+            """
+            if self._edge_weight is None:
+                prev_edge_time = self.edge_time[:self.num_edges]
+                if self.time_weighing == "linear":
+                    weights = 1 - ((self.weight_time - prev_edge_time) / self.num_matches)
                 else:
-                    raise ValueError(f"Unknown time weighing strategy: {time_weighing}")
-
-                self.edge_weight = torch.tensor(weights, dtype=torch.float32)
-            else:
-                self.edge_weight = torch.tensor([], dtype=torch.float32)
+                    weights = np.exp(- (self.weight_time - prev_edge_time))
+                self._edge_weight = torch.tensor(weights, dtype=torch.float32)
+            return self._edge_weight
 
         def build_graph(self) -> Data:
             """
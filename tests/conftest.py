@@ -0,0 +1,74 @@
+import pathlib
+
+import numpy as np
+import pandas as pd
+import pytest
+import torch
+from sklearn.linear_model import LogisticRegression
+
+from sports_prediction_framework.datawrapper.DataHandler import DataHandler
+from sports_prediction_framework.datawrapper.DataWrapper import DataWrapper
+from sports_prediction_framework.datawrapper.SportType import SportType
+from sports_prediction_framework.model.FlatModel import FlatModel
+from sports_prediction_framework.model.Scikit import ScikitModel
+from sports_prediction_framework.transformer.DataSelector import DataSelector
+from sports_prediction_framework.transformer.Scope import ScopeExpander, ScopeRoller
+from sports_prediction_framework.transformer.ScopeSelector import WindowSelector
+from sports_prediction_framework.transformer.Transformer import Transformer
+
+DATA = pathlib.Path(__file__).resolve().parents[1] / "examples" / "data.parquet"
+
+
+@pytest.fixture(scope="session")
+def football():
+    """Five seasons of matches wrapped for the torch models."""
+    df = pd.read_parquet(DATA)
+    df = df[df["Season"] <= 2008].reset_index(drop=True)
+    return Transformer().transform(SportType.FOOTBALL.get_wrapper()(DataHandler(df)))
+
+
+@pytest.fixture(scope="session")
+def tabular(football):
+    """The same matches as a plain wrapper with team IDs as features, for scikit-learn models."""
+    wrapper = DataWrapper(DataHandler(football.get_dataframe(), feature_cols={"HID", "AID"}, label_cols={"WDL"}))
+    wrapper.total_set_of_teams_ids = set(football.total_set_of_teams_ids)
+    return wrapper
+
+
+@pytest.fixture
+def make_scope():
+    """Factory of walk-forward scopes: an expanding training window and the following season as test window."""
+    def make(wrapper, last=2008):
+        parameters = {"col": "Season", "start": 2004, "max": last, "size": 1, "stride": 1}
+        return DataSelector([WindowSelector(ScopeExpander(wrapper, dict(parameters)))],
+                            [WindowSelector(ScopeRoller(wrapper, dict(parameters)))])
+
+    return make
+
+
+@pytest.fixture
+def make_flat():
+    """Factory of small, freshly seeded flat models."""
+    def make(seed=0):
+        torch.manual_seed(seed)
+        np.random.seed(seed)
+        return FlatModel({"embed_dim": 4, "out_dim": 3, "n_dense": 2, "dense_dim": 8,
+                          "architecture_type": "rectangle", "batch_size": 64, "epochs": 2})
+
+    return make
+
+
+@pytest.fixture
+def make_logistic():
+    """Factory of deterministic scikit-learn models on the team IDs."""
+    def make(c=1.0):
+        model = ScikitModel(LogisticRegression, C=c, max_iter=200, random_state=0)
+        model.in_cols = ["HID", "AID"]
+        return model
+
+    return make
+
+
+def predictions(wrapper: DataWrapper) -> pd.DataFrame:
+    """Prediction columns of a wrapper returned by `Learner.compute`."""
+    return wrapper.get_dataframe()[wrapper.data_handler.prediction_cols]
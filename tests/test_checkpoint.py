@@ -0,0 +1,50 @@
+import os
+
+import pandas as pd
+import pytest
+import torch
+
+from conftest import predictions
+from sports_prediction_framework.learner.Checkpoint import Checkpointer
+from sports_prediction_framework.learner.Learner import Learner, Tester, Trainer, UpdatingLearner
+
+
+@pytest.fixture
+def build(football, make_scope, make_flat):
+    def make(checkpointer=None):
+        model = make_flat()
+        inner = Learner(Trainer(model), Tester(model), make_scope(football))
+        return UpdatingLearner(Trainer(model), Tester(model), make_scope(football), [inner], checkpointer=checkpointer)
+
+    return make
+
+
+def test_checkpointing_does_not_change_predictions(football, build, tmp_path):
+    plain = predictions(build().compute(football))
+    checkpointed = predictions(build(Checkpointer(str(tmp_path), every=1)).compute(football))
+    pd.testing.assert_frame_equal(checkpointed, plain)
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_resumed_run_predicts_like_an_uninterrupted_run(football, build, tmp_path, monkeypatch):
+    plain = predictions(build().compute(football))
+
+    train = Trainer.train
+    calls = []
+
+    def crashing(self, wrapper):
+        calls.append(wrapper)
+        if len(calls) == 6:
+            raise RuntimeError("killed")
+        train(self, wrapper)
+
+    monkeypatch.setattr(Trainer, "train", crashing)
+    with pytest.raises(RuntimeError):
+        build(Checkpointer(str(tmp_path), every=1)).compute(football)
+    monkeypatch.setattr(Trainer, "train", train)
+
+    checkpointer = Checkpointer(str(tmp_path))
+    assert checkpointer.latest() is not None
+    torch.manual_seed(123)
+    resumed = predictions(build(checkpointer).resume(football))
+    pd.testing.assert_frame_equal(resumed, plain)
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+from conftest import predictions
+from sports_prediction_framework.datawrapper.DataHandler import DataHandler
+from sports_prediction_framework.datawrapper.DataWrapper import DataWrapper
+from sports_prediction_framework.learner.Learner import Learner, Tester, Trainer, UpdatingLearner
+from sports_prediction_framework.learner.PredictionSink import PredictionSink
+from sports_prediction_framework.utils.Merger import Merger
+
+
+def annotated(parent: DataWrapper, seed: int) -> DataWrapper:
+    index = parent.get_dataframe().index
+    predicted = np.random.default_rng(seed).random(len(index)) < 0.7
+    sink = PredictionSink(index)
+    sink.write(pd.DataFrame(np.random.default_rng(seed).dirichlet(np.ones(3), predicted.sum()),
+                            index=index[predicted]))
+    return sink.annotate(parent)
+
+
+def test_index_strategy_appends_the_columns_of_every_wrapper():
+    data = pd.DataFrame({'MatchID': np.arange(6) + 100, 'HID': [0, 1, 2, 0, 1, 2], 'AID': [1, 2, 0, 2, 0, 1],
+                         'Odds': [1.5, np.nan, 2.0, np.nan, 3.0, 1.2], 'WDL': [0, 1, 2, 0, 1, 2]},
+                        index=[9, 4, 7, 1, 3, 8])
+    parent = DataWrapper(DataHandler(data, feature_cols={'HID', 'AID'}, label_cols={'WDL'}))
+    parent.total_set_of_teams_ids = {0, 1, 2}
+    wrappers = [annotated(parent, seed) for seed in range(3)]
+
+    merged = Merger('index').compute(wrappers, parent)
+    frame = merged.get_dataframe()
+
+    assert frame.index.equals(data.index)
+    assert frame.columns.tolist() == data.columns.tolist() + [0, 1, 2, '0_1', '1_1', '2_1', '0_2', '1_2', '2_2']
+    for i, wrapper in enumerate(wrappers):
+        names = [c if i == 0 else f"{c}_{i}" for c in (0, 1, 2)]
+        np.testing.assert_array_equal(frame[names].to_numpy(), predictions(wrapper).to_numpy())
+    pd.testing.assert_frame_equal(Merger('key').compute(wrappers, parent).get_dataframe(), frame)
+
+
+def test_nested_learners_pass_their_predictions_to_the_outer_learner(tabular, make_scope, make_logistic,
+                                                                     monkeypatch):
+    expected = []
+    for c in (1.0, 0.01):
+        model = make_logistic(c)
+        plain = UpdatingLearner(Trainer(model), Tester(model), make_scope(tabular))
+        expected.append(predictions(plain.compute(tabular)).dropna())
+
+    inner = [Learner(Trainer(m), Tester(m), make_scope(tabular)) for m in (make_logistic(1.0), make_logistic(0.01))]
+    outer = make_logistic()
+    learner = UpdatingLearner(Trainer(outer), Tester(outer), make_scope(tabular), inner)
+    merged = []
+    compute = learner.merger.compute
+
+    def recorded(wrappers, parent=None):
+        merged.append(compute(wrappers, parent))
+        return merged[-1]
+
+    monkeypatch.setattr(learner.merger, 'compute', recorded)
+    learner.compute(tabular)
+
+    # Replaying every iteration into a sink keeps the first prediction of each row, as the plain runs do
+    for columns, plain in zip(([0, 1, 2], ['0_1', '1_1', '2_1']), expected):
+        sink = PredictionSink(tabular.get_dataframe().index)
+        for wrapper in merged:
+            sink.write(wrapper.get_dataframe()[columns].dropna())
+        np.testing.assert_allclose(sink.to_frame().to_numpy(), plain.to_numpy(), rtol=1e-6)
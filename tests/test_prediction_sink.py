@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+from conftest import predictions
+from sports_prediction_framework.datawrapper.DataHandler import DataHandler
+from sports_prediction_framework.datawrapper.DataWrapper import DataWrapper
+from sports_prediction_framework.learner.Learner import Tester, Trainer, UpdatingLearner
+from sports_prediction_framework.learner.PredictionSink import PredictionSink
+
+
+def test_rows_keep_their_first_prediction():
+    sink = PredictionSink(pd.Index([10, 20, 30, 40]))
+    sink.write(pd.DataFrame({'p': [0.1, 0.2]}, index=[20, 30]))
+    sink.write(pd.DataFrame({'p': [0.9, 0.4]}, index=[30, 40]))
+
+    frame = sink.to_frame()
+    assert frame.index.tolist() == [20, 30, 40]
+    assert np.allclose(frame['p'], [0.1, 0.2, 0.4])
+
+
+def test_positional_write_matches_label_lookup():
+    index = pd.Index([5, 3, 9, 1])
+    values = pd.DataFrame({'a': [1.0, 2.0], 'b': [3.0, 4.0]}, index=[9, 5])
+
+    by_label = PredictionSink(index)
+    by_label.write(values)
+    by_position = PredictionSink(index)
+    by_position.write(values, np.array([2, 0]))
+
+    pd.testing.assert_frame_equal(by_position.to_frame(), by_label.to_frame())
+
+
+def test_labels_outside_the_dataset_are_ignored():
+    sink = PredictionSink(pd.Index([1, 2]))
+    sink.write(pd.DataFrame({'p': [0.5, 0.7]}, index=[2, 99]))
+    assert len(sink) == 1
+    assert sink.to_frame().index.tolist() == [2]
+
+
+def test_annotate_shares_the_dataset_columns():
+    data = pd.DataFrame({'x': np.arange(3.0)}, index=[7, 8, 9])
+    wrapper = DataWrapper(DataHandler(data))
+    sink = PredictionSink(data.index)
+    sink.write(pd.DataFrame({'p': [0.25]}, index=[8]))
+
+    annotated = sink.annotate(wrapper)
+    frame = annotated.get_dataframe()
+    assert annotated.data_handler.prediction_cols == ['p']
+    assert np.isnan(frame.loc[7, 'p']) and frame.loc[8, 'p'] == 0.25
+    assert np.shares_memory(frame['x'].to_numpy(), data['x'].to_numpy())
+    assert 'p' not in wrapper.get_dataframe().columns
+
+
+def test_positional_run_predicts_like_label_run(tabular, make_scope, make_logistic, monkeypatch):
+    # A live scope is written by label, a materialized one by the planned row positions
+    model = make_logistic()
+    by_label = UpdatingLearner(Trainer(model), Tester(model), make_scope(tabular)).compute(tabular)
+
+    model = make_logistic()
+    learner = UpdatingLearner(Trainer(model), Tester(model), make_scope(tabular))
+    learner.materialize_splits(tabular)
+    calls = []
+    lookup = PredictionSink.positions
+
+    def counted(sink, labels):
+        calls.append(len(labels))
+        return lookup(sink, labels)
+
+    monkeypatch.setattr(PredictionSink, 'positions', counted)
+    by_position = learner.compute(tabular)
+
+    assert calls == []
+    pd.testing.assert_frame_equal(predictions(by_position), predictions(by_label))
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import predictions
+from sports_prediction_framework.learner.Learner import Tester, Trainer, UpdatingLearner
+from sports_prediction_framework.learner.SplitExecutor import SplitExecutor
+
+
+def test_thread_workers_predict_like_sequential_run(tabular, make_scope, make_logistic):
+    model = make_logistic()
+    sequential = UpdatingLearner(Trainer(model), Tester(model), make_scope(tabular)).compute(tabular)
+
+    model = make_logistic()
+    parallel = UpdatingLearner(Trainer(model), Tester(model), make_scope(tabular),
+                               parallel='thread', n_jobs=3).compute(tabular)
+
+    pd.testing.assert_frame_equal(predictions(parallel), predictions(sequential))
+
+
+def test_outputs_follow_split_order(tabular, make_scope, make_logistic):
+    model = make_logistic()
+    scope = make_scope(tabular)
+    splits = [split for split in scope.iter_splits(tabular) if len(split.train_rows) and len(split.test_rows)]
+
+    outputs = SplitExecutor('thread', n_jobs=3).run(Trainer(model), Tester(model), tabular,
+                                                   scope.iter_splits(tabular))
+
+    assert len(outputs) == len(splits) > 1
+    index = tabular.get_dataframe().index
+    for split, (rows, frame) in zip(splits, outputs):
+        assert np.array_equal(rows, split.test_rows)
+        assert frame.index.equals(index[split.test_rows])
+
+
+def test_process_workers_do_not_depend_on_worker_count(football, make_scope, make_flat):
+    runs = []
+    for n_jobs in (1, 2):
+        model = make_flat()
+        learner = UpdatingLearner(Trainer(model), Tester(model), make_scope(football, last=2006),
+                                  parallel='process', n_jobs=n_jobs, seed=0)
+        runs.append(predictions(learner.compute(football)))
+
+    assert runs[0].notna().all(axis=1).sum() > 0
+    pd.testing.assert_frame_equal(runs[0], runs[1])
+
+
+def test_threads_reject_models_using_global_random_generators(football, make_scope, make_flat):
+    model = make_flat()
+    learner = UpdatingLearner(Trainer(model), Tester(model), make_scope(football), parallel='thread')
+    with pytest.raises(ValueError, match="global random generators"):
+        learner.compute(football)
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from conftest import predictions
+from sports_prediction_framework.learner.Learner import Tester, Trainer, UpdatingLearner
+from sports_prediction_framework.transformer.SplitPlan import SplitPlan
+
+
+def test_planned_splits_match_live_selection(tabular, make_scope):
+    plan = make_scope(tabular).materialize(tabular)
+    live = make_scope(tabular)
+    index = tabular.get_dataframe().index
+
+    steps = 0
+    while live.holds():
+        split = plan.split_at(steps)
+        assert index[split.train_rows].equals(live.transform_train(tabular).get_dataframe().index)
+        assert index[split.test_rows].equals(live.transform_test(tabular).get_dataframe().index)
+        live.update()
+        steps += 1
+    assert steps > 1
+
+
+def test_planned_run_predicts_like_live_run(tabular, make_scope, make_logistic):
+    model = make_logistic()
+    live = UpdatingLearner(Trainer(model), Tester(model), make_scope(tabular)).compute(tabular)
+
+    model = make_logistic()
+    learner = UpdatingLearner(Trainer(model), Tester(model), make_scope(tabular))
+    learner.materialize_splits(tabular)
+    planned = learner.compute(tabular)
+
+    assert predictions(live).notna().all(axis=1).sum() > 0
+    pd.testing.assert_frame_equal(predictions(planned), predictions(live))
+
+
+def test_saved_plan_drives_a_fresh_scope(tabular, make_scope, tmp_path):
+    plan = make_scope(tabular).materialize(tabular)
+    plan.save(str(tmp_path / "plan.pkl"))
+    loaded = SplitPlan.load(str(tmp_path / "plan.pkl"))
+
+    scope = make_scope(tabular)
+    scope.add_plan(loaded)
+    assert loaded.matches(tabular)
+    assert len(loaded) == len(plan)
+    for original, restored in zip(plan, loaded):
+        assert np.array_equal(original.train_rows, restored.train_rows)
+        assert np.array_equal(original.test_rows, restored.test_rows)
+    assert scope.planned_split(tabular) is not None
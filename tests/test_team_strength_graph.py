@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+
+from sports_prediction_framework.utils.TeamStrengthGraph import TeamStrengthGraph
+
+
+def test_nodes_maps_team_ids_to_node_indices():
+    graph = TeamStrengthGraph.Graph(3, 10, np.array([2, 5, 9]))
+    assert graph.nodes([9, 2, 5]).tolist() == [2, 0, 1]
+
+
+def test_nodes_rejects_missing_team_inside_id_range():
+    graph = TeamStrengthGraph.Graph(3, 10, np.array([2, 5, 9]))
+    with pytest.raises(KeyError, match=r"\[6\]"):
+        graph.nodes([5, 6, 9])
+
+
+def test_nodes_rejects_team_beyond_largest_id():
+    graph = TeamStrengthGraph.Graph(3, 10, np.array([2, 5, 9]))
+    with pytest.raises(KeyError, match=r"\[1, 10\]"):
+        graph.nodes([1, 2, 10])